@@ -5,9 +5,13 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import List, Optional
 from enum import Enum
+import sys
 import uuid
 import json
 
+# Python 3.10+ 支持 dataclass(slots=True)，任务对象更省内存、属性访问更快
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class TaskStatus(Enum):
     """任务状态"""
@@ -17,7 +21,7 @@ class TaskStatus(Enum):
     FAILED = "failed"        # 失败
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PublishTask:
     """发布任务"""
     id: str
@@ -34,9 +38,10 @@ class PublishTask:
     max_retries: int = 3        # 最大重试次数
     
     def __post_init__(self):
+        now = datetime.now()
         if self.created_time is None:
-            self.created_time = datetime.now()
-        self.updated_time = datetime.now()
+            self.created_time = now
+        self.updated_time = now
     
     @classmethod
     def create_new(cls, title: str, content: str, images: List[str], 
@@ -81,10 +86,10 @@ class PublishTask:
         
         return cls(**data)
     
-    def is_ready_to_execute(self) -> bool:
-        """检查是否准备执行"""
+    def is_ready_to_execute(self, now: Optional[datetime] = None) -> bool:
+        """检查是否准备执行（批量检查时可传入统一的当前时间）"""
         return (self.status == TaskStatus.PENDING and 
-                self.publish_time <= datetime.now())
+                self.publish_time <= (now or datetime.now()))
     
     def can_retry(self) -> bool:
         """检查是否可以重试"""
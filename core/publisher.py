@@ -11,9 +11,6 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List
 
-# 添加项目路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from playwright.async_api import async_playwright, Page, BrowserContext
 import logging
 
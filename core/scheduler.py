@@ -7,7 +7,7 @@ import json
 from pathlib import Path
 from datetime import datetime
 from typing import List, Optional, Callable
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QObject, QThread, QTimer, QMetaObject, pyqtSignal, pyqtSlot
 from loguru import logger
 
 from .models import PublishTask, TaskStatus, PublishResult
@@ -23,12 +23,18 @@ class SimpleScheduler(QObject):
     task_completed = pyqtSignal(str, dict)  # 任务完成 (task_id, result)
     task_failed = pyqtSignal(str, str)  # 任务失败 (task_id, error_message)
     scheduler_status = pyqtSignal(str)  # 调度器状态变化
+    statistics_changed = pyqtSignal(dict)  # 任务统计变化 (get_task_statistics的结果)
+    running_changed = pyqtSignal(bool)  # 调度器运行状态变化
+    # 发布线程的执行结果，经排队连接转到调度器所在的界面线程处理
+    _worker_succeeded = pyqtSignal(str, dict)
+    _worker_failed = pyqtSignal(str, str)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         
         # 存储管理器 - 适配打包环境
         self.task_storage = TaskStorage()
+        self.task_storage.on_changed = self._on_tasks_changed
         
         # 配置管理 - 使用打包环境适配的配置
         try:
@@ -46,6 +52,8 @@ class SimpleScheduler(QObject):
         self.process_manager.process_finished.connect(self._handle_task_success)
         self.process_manager.process_failed.connect(self._handle_task_error)
         self.process_manager.process_started.connect(lambda task_id: self.task_started.emit(task_id))
+        self._worker_succeeded.connect(self._handle_task_success)
+        self._worker_failed.connect(self._handle_task_error)
         
         # QTimer定时器
         self.timer = QTimer(self)
@@ -76,6 +84,7 @@ class SimpleScheduler(QObject):
         
         logger.info(f"🚀 调度器已启动，检查间隔: {self.config.check_interval_seconds}秒")
         self.scheduler_status.emit("运行中")
+        self.running_changed.emit(True)
         
         # 立即执行一次检查
         self.check_and_execute_tasks()
@@ -101,6 +110,8 @@ class SimpleScheduler(QObject):
             
             logger.info("🛑 调度器已停止")
             self.scheduler_status.emit("已停止")
+            self.running_changed.emit(False)
+            self._on_tasks_changed()  # 执行中任务记录已清空
             
         except Exception as e:
             logger.error(f"❌ 停止调度器失败: {e}")
@@ -116,6 +127,13 @@ class SimpleScheduler(QObject):
             logger.info(f"➕ 添加任务: {task.title} (发布时间: {task.publish_time})")
         return success
     
+    def add_tasks(self, tasks: List[PublishTask]) -> int:
+        """批量添加任务，返回成功添加的数量"""
+        valid_tasks = [task for task in tasks if task and task.title.strip()]
+        if len(valid_tasks) < len(tasks):
+            logger.error(f"❌ 跳过 {len(tasks) - len(valid_tasks)} 个无效的任务数据")
+        return self.task_storage.add_tasks(valid_tasks)
+    
     def delete_task(self, task_id: str) -> bool:
         """删除任务"""
         if not task_id or not task_id.strip():
@@ -127,10 +145,35 @@ class SimpleScheduler(QObject):
             logger.info(f"🗑️ 删除任务: {task_id[:8]}")
         return success
     
+    def delete_tasks(self, task_ids: List[str]) -> int:
+        """批量删除任务，返回成功删除的数量"""
+        return self.task_storage.delete_tasks([task_id for task_id in task_ids if task_id])
+    
     def get_all_tasks(self) -> List[PublishTask]:
         """获取所有任务"""
         return self.task_storage.load_tasks()
     
+    def get_tasks(self, status: Optional[TaskStatus] = None) -> List[PublishTask]:
+        """获取任务，指定状态时只取该状态的任务"""
+        if status is None:
+            return self.task_storage.load_tasks()
+        return self.task_storage.get_tasks_by_status(status)
+    
+    def get_task_count(self, status: Optional[TaskStatus] = None) -> int:
+        """获取任务数量，指定状态时只统计该状态"""
+        if status is None:
+            return self.task_storage.count_tasks()
+        return self.task_storage.count_by_status(status)
+    
+    @property
+    def tasks_version(self) -> int:
+        """任务版本号，任务增删改后变化"""
+        return self.task_storage.version
+    
+    def get_pending_count(self) -> int:
+        """获取待执行任务数量"""
+        return self.task_storage.count_by_status(TaskStatus.PENDING)
+    
     def get_task_by_id(self, task_id: str) -> Optional[PublishTask]:
         """根据ID获取任务"""
         if not task_id or not task_id.strip():
@@ -210,8 +253,8 @@ class SimpleScheduler(QObject):
             
             # 标记任务开始执行
             task.mark_running()
-            self.task_storage.update_task(task)
             self.executing_tasks.add(task.id)
+            self.task_storage.update_task(task)
             
             logger.info(f"🚀 开始执行任务: {task.title}")
             self.task_started.emit(task.id)
@@ -347,12 +390,12 @@ class SimpleScheduler(QObject):
                     loop.close()
                     
                     logger.info(f"✅ 任务执行完成: {task.title}")
-                    # 成功回调
-                    self._handle_task_success(task.id, {"status": "success", "result": result})
+                    # 成功回调（在界面线程中更新任务存储）
+                    self._worker_succeeded.emit(task.id, {"status": "success", "result": result})
                 except Exception as e:
                     logger.error(f"❌ 任务执行失败: {task.title} - {e}")
-                    # 失败回调
-                    self._handle_task_error(task.id, str(e))
+                    # 失败回调（在界面线程中更新任务存储）
+                    self._worker_failed.emit(task.id, str(e))
             
             thread = threading.Thread(target=run_async_task, daemon=True)
             thread.start()
@@ -369,8 +412,8 @@ class SimpleScheduler(QObject):
         try:
             # 标记任务开始执行
             task.mark_running()
-            self.task_storage.update_task(task)
             self.executing_tasks.add(task.id)
+            self.task_storage.update_task(task)
             
             logger.info(f"🚀 开始执行任务: {task.title}")
             
@@ -394,8 +437,8 @@ class SimpleScheduler(QObject):
                 return
                 
             task.mark_completed(result.get("message", "发布成功"))
-            self.task_storage.update_task(task)
             self.executing_tasks.discard(task_id)
+            self.task_storage.update_task(task)
             
             logger.info(f"✅ 任务执行成功: {task.title}")
             self.task_completed.emit(task_id, result)
@@ -411,12 +454,13 @@ class SimpleScheduler(QObject):
                 logger.error(f"❌ 找不到任务: {task_id}")
                 # 创建临时任务对象以发送信号
                 self.executing_tasks.discard(task_id)
+                self._on_tasks_changed()  # 执行中任务记录已变化
                 self.task_failed.emit(task_id, error_message)
                 return
                 
             task.mark_failed(error_message)
-            self.task_storage.update_task(task)
             self.executing_tasks.discard(task_id)
+            self.task_storage.update_task(task)
             
             if task.can_retry():
                 logger.warning(f"⚠️ 任务失败，将重试: {task.title} (重试次数: {task.retry_count}/{task.max_retries})")
@@ -430,19 +474,33 @@ class SimpleScheduler(QObject):
     
     def get_task_statistics(self) -> dict:
         """获取任务统计"""
-        tasks = self.task_storage.load_tasks()
-        
+        # 直接读取存储维护的状态计数，无需遍历任务
+        storage = self.task_storage
         stats = {
-            "total": len(tasks),
-            "pending": len([t for t in tasks if t.status == TaskStatus.PENDING]),
-            "running": len([t for t in tasks if t.status == TaskStatus.RUNNING]),
-            "completed": len([t for t in tasks if t.status == TaskStatus.COMPLETED]),
-            "failed": len([t for t in tasks if t.status == TaskStatus.FAILED]),
+            "total": storage.count_tasks(),
+            "pending": storage.count_by_status(TaskStatus.PENDING),
+            "running": storage.count_by_status(TaskStatus.RUNNING),
+            "completed": storage.count_by_status(TaskStatus.COMPLETED),
+            "failed": storage.count_by_status(TaskStatus.FAILED),
             "executing": len(self.executing_tasks)
         }
         
         return stats
     
+    @pyqtSlot()
+    def _on_tasks_changed(self):
+        """任务存储变化时推送最新统计"""
+        # 统计需读取状态桶和执行中任务，只在调度器所在线程中生成
+        if QThread.currentThread() != self.thread():
+            QMetaObject.invokeMethod(self, "_on_tasks_changed", Qt.ConnectionType.QueuedConnection)
+            return
+        self.statistics_changed.emit(self.get_task_statistics())
+    
+    def emit_current_state(self):
+        """主动推送当前运行状态和任务统计（用于手动刷新）"""
+        self.running_changed.emit(self.is_running)
+        self._on_tasks_changed()
+    
     def cleanup_old_tasks(self, keep_days: int = 7):
         """清理旧任务"""
         try:
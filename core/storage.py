@@ -1,53 +1,149 @@
 """
 数据存储管理
 """
+import hashlib
 import json
-from typing import List, Optional
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
 from pathlib import Path
+from PyQt6.QtCore import QCoreApplication, QTimer
 from loguru import logger
 
 from .models import PublishTask, AppConfig, TaskStatus
 
+# 优先使用更快的ujson（见requirements.txt），不可用时回退到标准库
+try:
+    import ujson
+    
+    def json_loads(text):
+        return ujson.loads(text)
+    
+    def json_dumps(data) -> str:
+        return ujson.dumps(data, ensure_ascii=False, indent=2, escape_forward_slashes=False)
+except ImportError:
+    def json_loads(text):
+        return json.loads(text)
+    
+    def json_dumps(data) -> str:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def write_json_atomic(file_path: Path, data: Any, last_digest: Optional[bytes] = None) -> bytes:
+    """
+    原子写入JSON文件
+    
+    先写入同目录下的 .tmp 临时文件再替换目标文件，避免写入中途崩溃损坏文件；
+    内容摘要与上次写入相同且文件仍存在时跳过写入。
+    
+    Returns:
+        本次内容的摘要，供下次调用比较
+    """
+    payload = json_dumps(data).encode('utf-8')
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    if digest == last_digest and file_path.exists():
+        return digest
+    
+    temp_path = file_path.with_suffix('.tmp')
+    temp_path.write_bytes(payload)
+    os.replace(temp_path, file_path)
+    return digest
+
 
 class TaskStorage:
     """任务存储管理器 - 内存存储版本"""
     
     def __init__(self, file_path: str = "tasks.json"):
-        # 内存中存储任务列表
-        self._tasks: List[PublishTask] = []
+        # 内存中按任务ID索引存储（dict保持插入顺序）
+        self._tasks: Dict[str, PublishTask] = {}
+        # 按状态分桶的二级索引，避免每次查询都遍历全部任务
+        self._by_status: Dict[TaskStatus, Dict[str, PublishTask]] = {
+            status: {} for status in TaskStatus
+        }
+        # 任务变化回调（由调度器设置，用于推送状态更新）
+        self.on_changed: Optional[Callable[[], None]] = None
+        # 任务版本号，每次增删改任务时递增，供界面判断任务是否变化
+        self.version = 0
         logger.info("🧠 TaskStorage初始化 - 使用内存存储")
     
+    def _notify_changed(self):
+        """通知任务已变化"""
+        self.version += 1
+        if self.on_changed:
+            try:
+                self.on_changed()
+            except Exception as e:
+                logger.error(f"❌ 任务变化回调失败: {e}")
+    
+    def _index_status(self, task: PublishTask):
+        """将任务放入当前状态对应的桶"""
+        for bucket in self._by_status.values():
+            bucket.pop(task.id, None)
+        self._by_status[task.status][task.id] = task
+    
+    def _unindex_status(self, task_id: str):
+        """从状态索引中移除任务"""
+        for bucket in self._by_status.values():
+            bucket.pop(task_id, None)
+    
+    def _rebuild_status_index(self):
+        """重建状态索引"""
+        for bucket in self._by_status.values():
+            bucket.clear()
+        for task in self._tasks.values():
+            self._by_status[task.status][task.id] = task
+    
     def load_tasks(self) -> List[PublishTask]:
         """加载所有任务"""
-        logger.debug(f"📋 加载了 {len(self._tasks)} 个任务")
-        return self._tasks.copy()
+        logger.opt(lazy=True).debug("📋 加载了 {} 个任务", lambda: len(self._tasks))
+        return list(self._tasks.values())
     
     def save_tasks(self, tasks: List[PublishTask]):
         """保存所有任务到内存"""
-        self._tasks = tasks.copy()
-        logger.debug(f"💾 内存保存了 {len(tasks)} 个任务")
+        self._tasks = {t.id: t for t in tasks}
+        self._rebuild_status_index()
+        logger.opt(lazy=True).debug("💾 内存保存了 {} 个任务", lambda: len(tasks))
+        self._notify_changed()
     
     def add_task(self, task: PublishTask) -> bool:
         """添加任务"""
         try:
-            self._tasks.append(task)
+            self._tasks[task.id] = task
+            self._index_status(task)
             logger.info(f"➕ 添加任务: {task.title} (ID: {task.id[:8]})")
+            self._notify_changed()
             return True
         except Exception as e:
             logger.error(f"❌ 添加任务失败: {e}")
             return False
     
+    def add_tasks(self, tasks: List[PublishTask]) -> int:
+        """批量添加任务，全部添加后只通知一次变化"""
+        added_count = 0
+        try:
+            for task in tasks:
+                self._tasks[task.id] = task
+                self._index_status(task)
+                added_count += 1
+            logger.info(f"➕ 批量添加了 {added_count} 个任务")
+        except Exception as e:
+            logger.error(f"❌ 批量添加任务失败: {e}")
+        if added_count > 0:
+            self._notify_changed()
+        return added_count
+    
     def update_task(self, task: PublishTask) -> bool:
         """更新任务"""
         try:
-            for i, t in enumerate(self._tasks):
-                if t.id == task.id:
-                    self._tasks[i] = task
-                    logger.debug(f"🔄 更新任务: {task.title} (ID: {task.id[:8]})")
-                    return True
+            if task.id not in self._tasks:
+                logger.warning(f"⚠️ 未找到要更新的任务: {task.id}")
+                return False
             
-            logger.warning(f"⚠️ 未找到要更新的任务: {task.id}")
-            return False
+            self._tasks[task.id] = task
+            self._index_status(task)
+            logger.opt(lazy=True).debug("🔄 更新任务: {} (ID: {})", lambda: task.title, lambda: task.id[:8])
+            self._notify_changed()
+            return True
         except Exception as e:
             logger.error(f"❌ 更新任务失败: {e}")
             return False
@@ -55,11 +151,10 @@ class TaskStorage:
     def delete_task(self, task_id: str) -> bool:
         """删除任务"""
         try:
-            initial_count = len(self._tasks)
-            self._tasks = [t for t in self._tasks if t.id != task_id]
-            
-            if len(self._tasks) < initial_count:
+            if self._tasks.pop(task_id, None) is not None:
+                self._unindex_status(task_id)
                 logger.info(f"🗑️ 删除任务: {task_id[:8]}")
+                self._notify_changed()
                 return True
             else:
                 logger.warning(f"⚠️ 未找到要删除的任务: {task_id}")
@@ -68,43 +163,74 @@ class TaskStorage:
             logger.error(f"❌ 删除任务失败: {e}")
             return False
     
+    def delete_tasks(self, task_ids: List[str]) -> int:
+        """批量删除任务，全部删除后只通知一次变化"""
+        removed_count = 0
+        try:
+            for task_id in task_ids:
+                if self._tasks.pop(task_id, None) is not None:
+                    self._unindex_status(task_id)
+                    removed_count += 1
+            logger.info(f"🗑️ 批量删除了 {removed_count} 个任务")
+        except Exception as e:
+            logger.error(f"❌ 批量删除任务失败: {e}")
+        if removed_count > 0:
+            self._notify_changed()
+        return removed_count
+    
     def get_task_by_id(self, task_id: str) -> Optional[PublishTask]:
         """根据ID获取任务"""
-        for task in self._tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._tasks.get(task_id)
     
     def get_pending_tasks(self) -> List[PublishTask]:
-        """获取待执行的任务"""
-        return [t for t in self._tasks if t.status == TaskStatus.PENDING]
+        """获取待执行的任务（直接读取状态桶）"""
+        return list(self._by_status[TaskStatus.PENDING].values())
     
     def get_ready_tasks(self) -> List[PublishTask]:
         """获取准备执行的任务（时间已到）"""
-        return [t for t in self._tasks if t.is_ready_to_execute()]
+        # 只需检查等待中的任务
+        pending = list(self._by_status[TaskStatus.PENDING].values())
+        now = datetime.now()
+        return [t for t in pending if t.is_ready_to_execute(now)]
+    
+    def get_tasks_by_status(self, status: TaskStatus) -> List[PublishTask]:
+        """获取指定状态的任务（直接读取状态桶）"""
+        return list(self._by_status[status].values())
+    
+    def count_by_status(self, status: TaskStatus) -> int:
+        """获取指定状态的任务数量（直接读取状态桶大小）"""
+        return len(self._by_status[status])
+    
+    def count_tasks(self) -> int:
+        """获取任务总数"""
+        return len(self._tasks)
     
     def get_failed_retry_tasks(self) -> List[PublishTask]:
         """获取可重试的失败任务"""
-        return [t for t in self._tasks if t.can_retry()]
+        failed = list(self._by_status[TaskStatus.FAILED].values())
+        return [t for t in failed if t.can_retry()]
     
     def cleanup_old_tasks(self, keep_days: int = 7):
         """清理旧任务"""
-        from datetime import datetime, timedelta
+        from datetime import timedelta
         
         try:
             cutoff_time = datetime.now() - timedelta(days=keep_days)
             
-            # 保留未完成的任务和最近的已完成任务
-            filtered_tasks = []
-            for task in self._tasks:
-                if (task.status in [TaskStatus.PENDING, TaskStatus.RUNNING] or
-                    (task.updated_time and task.updated_time > cutoff_time)):
-                    filtered_tasks.append(task)
+            # 保留未完成的任务和最近的已完成任务，其余原地删除
+            stale_ids = [
+                task_id for task_id, task in self._tasks.items()
+                if not (task.status in (TaskStatus.PENDING, TaskStatus.RUNNING) or
+                        (task.updated_time and task.updated_time > cutoff_time))
+            ]
+            for task_id in stale_ids:
+                del self._tasks[task_id]
+                self._unindex_status(task_id)
             
-            removed_count = len(self._tasks) - len(filtered_tasks)
+            removed_count = len(stale_ids)
             if removed_count > 0:
-                self._tasks = filtered_tasks
                 logger.info(f"🧹 清理了 {removed_count} 个旧任务")
+                self._notify_changed()
             
         except Exception as e:
             logger.error(f"❌ 清理旧任务失败: {e}")
@@ -113,6 +239,7 @@ class TaskStorage:
         """清理所有资源（应用退出时调用）"""
         try:
             self._tasks.clear()
+            self._rebuild_status_index()
             logger.info("✅ 内存存储资源清理完成")
         except Exception as e:
             logger.error(f"❌ 清理存储资源失败: {e}")
@@ -123,14 +250,16 @@ class ConfigStorage:
     
     def __init__(self, file_path: str = "config.json"):
         self.file_path = Path(file_path)
+        self._saved_digest: Optional[bytes] = None  # 上次写入内容的摘要
+        self._dirty = False  # 是否有未写入的配置修改
+        self._flush_scheduled = False
         self.config = self.load_config()
     
     def load_config(self) -> AppConfig:
         """加载配置"""
         try:
             if self.file_path.exists():
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = json_loads(self.file_path.read_text(encoding='utf-8'))
                 return AppConfig.from_dict(data)
             else:
                 # 使用默认配置
@@ -144,8 +273,9 @@ class ConfigStorage:
     def save_config(self, config: AppConfig):
         """保存配置"""
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(config.to_dict(), f, ensure_ascii=False, indent=2)
+            self._saved_digest = write_json_atomic(
+                self.file_path, config.to_dict(), self._saved_digest
+            )
             logger.debug("配置已保存")
         except Exception as e:
             logger.error(f"保存配置失败: {e}")
@@ -155,15 +285,41 @@ class ConfigStorage:
         return self.config
     
     def update_config(self, **kwargs):
-        """更新配置"""
+        """更新配置（短时间内的多次更新合并为一次写入）"""
+        changed = False
         for key, value in kwargs.items():
-            if hasattr(self.config, key):
+            if hasattr(self.config, key) and getattr(self.config, key) != value:
                 setattr(self.config, key, value)
-        self.save_config(self.config)
+                changed = True
+        
+        if changed:
+            self._dirty = True
+            self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """延迟写入配置"""
+        if QCoreApplication.instance() is None:
+            # 没有Qt事件循环时直接写入
+            self.flush()
+            return
+        
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(200, self.flush)
+    
+    def flush(self):
+        """写入尚未保存的配置修改"""
+        self._flush_scheduled = False
+        if self._dirty:
+            self._dirty = False
+            self.save_config(self.config)
     
     def cleanup_resources(self):
         """清理配置存储资源"""
         try:
+            # 写入尚未保存的修改
+            self.flush()
+            
             # 清理临时配置文件
             temp_config = self.file_path.with_suffix('.tmp')
             if temp_config.exists():
@@ -3,21 +3,315 @@
 参考专业界面设计，采用表格式布局
 """
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
     QHeaderView, QAbstractItemView, QLineEdit, QLabel, QMessageBox, QComboBox,
-    QTextEdit, QGroupBox, QFormLayout
+    QTextEdit, QGroupBox, QFormLayout, QStyledItemDelegate, QStyle,
+    QDialog, QDialogButtonBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QBrush, QColor
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QEvent, QRect, QRectF, QTimer
+)
+from PyQt6.QtGui import QFont, QBrush, QColor, QPainter, QCursor, QTextCursor, QPalette
 from loguru import logger
 
-# 添加core模块路径
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from core.storage import json_loads, write_json_atomic
+
+
+# 状态分类代码
+STATUS_OK, STATUS_ERROR, STATUS_WARN = range(3)
+
+# 状态颜色画刷（按状态代码索引），全局复用，避免每行重复构造
+_STATUS_BG = [QBrush(QColor("#d4edda")), QBrush(QColor("#f8d7da")), QBrush(QColor("#fff3cd"))]
+_STATUS_FG = [QBrush(QColor("#155724")), QBrush(QColor("#721c24")), QBrush(QColor("#856404"))]
+
+
+@lru_cache(maxsize=64)
+def status_code(status: str) -> int:
+    """状态文本对应的分类代码（状态种类很少，按文本缓存）"""
+    if '有效' in status:
+        return STATUS_OK
+    if '失效' in status or '失败' in status:
+        return STATUS_ERROR
+    return STATUS_WARN
+
+
+@lru_cache(maxsize=1024)
+def format_last_login(last_login: str) -> str:
+    """格式化最后登录时间（按原始字符串缓存，避免每次刷新重复解析）"""
+    if not last_login:
+        return ""
+    try:
+        if 'T' in last_login:  # ISO格式
+            dt = datetime.fromisoformat(last_login.replace('Z', '+00:00'))
+            return dt.strftime("%Y-%m-%d %H:%M")
+        return last_login
+    except ValueError:
+        return last_login
+
+
+class AccountTableModel(QAbstractTableModel):
+    """账号表格模型，只在视图请求时按需提供单元格数据
+    
+    各文本列在set_accounts时预先计算为并列的字符串列表，
+    data()直接按 列表[列][行] 取值，排序时按同一排列重排所有列。
+    文本列之后附加一列状态代码，同样预先计算，由StatusDelegate据此着色。
+    """
+    
+    HEADERS = ["平台", "账号名称", "状态", "最后登录时间", "备注", "操作", "测试"]
+    TEXT_COLUMNS = 5  # 前5列为文本列，其余为按钮列
+    STYLE_SLOT = TEXT_COLUMNS  # _columns中状态代码所在位置（不显示）
+    STATUS_CODE_ROLE = Qt.ItemDataRole.UserRole + 1
+    ACTION_COLUMN = 5
+    TEST_COLUMN = 6
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._accounts: List[dict] = []
+        self._columns: List[list] = [[] for _ in range(self.STYLE_SLOT + 1)]
+        self._row_by_name: Dict[str, int] = {}  # 账号名称 -> 行号
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+    
+    def set_accounts(self, accounts: List[dict]):
+        """替换全部账号数据"""
+        self.beginResetModel()
+        self._accounts = list(accounts)
+        rows = [self._row_values(acc) for acc in self._accounts]
+        self._columns = [list(col) for col in zip(*rows)] if rows else \
+            [[] for _ in range(self.STYLE_SLOT + 1)]
+        if self._sort_column >= 0:
+            self._apply_order(self._sorted_order())
+        self._reindex_rows()
+        self.endResetModel()
+    
+    def append_account(self, account: dict):
+        """追加单个账号，只通知新增的一行"""
+        row = len(self._accounts)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._accounts.append(account)
+        for col, value in zip(self._columns, self._row_values(account)):
+            col.append(value)
+        self._row_by_name[account['name']] = row
+        self.endInsertRows()
+        
+        if self._sort_column >= 0:
+            self.sort(self._sort_column, self._sort_order)
+    
+    def remove_account(self, account: dict) -> bool:
+        """移除单个账号，只通知被删除的一行"""
+        row = self.row_of(account['name'])
+        if row < 0:
+            return False
+        
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._accounts[row]
+        for col in self._columns:
+            del col[row]
+        self._reindex_rows()
+        self.endRemoveRows()
+        return True
+    
+    def update_account(self, account: dict) -> bool:
+        """账号内容变化后只刷新其所在行"""
+        row = self.row_of(account['name'])
+        if row < 0:
+            return False
+        
+        self._accounts[row] = account
+        for col, value in zip(self._columns, self._row_values(account)):
+            col[row] = value
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.TEXT_COLUMNS - 1))
+        
+        if self._sort_column >= 0:
+            self.sort(self._sort_column, self._sort_order)
+        return True
+    
+    def row_of(self, name: str) -> int:
+        """获取账号所在行号，不存在时返回-1"""
+        return self._row_by_name.get(name, -1)
+    
+    def _reindex_rows(self):
+        """重建账号名称到行号的索引"""
+        self._row_by_name = {acc['name']: row for row, acc in enumerate(self._accounts)}
+    
+    @staticmethod
+    def _row_values(account: dict) -> tuple:
+        """账号各文本列的显示值及状态代码"""
+        status = sys.intern(account.get('status', '未测试'))  # 状态种类少，共享同一字符串对象
+        return (
+            account['platform'],
+            account['name'],
+            status,
+            format_last_login(account.get('last_login', '')),
+            account.get('notes', ''),
+            status_code(status),
+        )
+    
+    def account_at(self, row: int) -> Optional[dict]:
+        """获取指定行的账号"""
+        if 0 <= row < len(self._accounts):
+            return self._accounts[row]
+        return None
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._accounts)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row = index.row()
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column < self.TEXT_COLUMNS:
+                return self._columns[column][row]
+            return None  # 按钮列由委托绘制
+        
+        if role == Qt.ItemDataRole.UserRole and column == 1:
+            return row  # 只返回行号，完整账号数据通过account_at获取，避免字典包装成QVariant
+        
+        if role == self.STATUS_CODE_ROLE and column == 2:
+            return self._columns[self.STYLE_SLOT][row]
+        
+        return None
+    
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        if column < 0:
+            self._sort_column = -1  # 未选择排序列，保持文件中的顺序
+            return
+        if column >= self.TEXT_COLUMNS:
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        
+        order_rows = self._sorted_order()
+        self._apply_order(order_rows)
+        
+        # 排序后让选中等持久索引跟随原账号
+        new_rows = {old: new for new, old in enumerate(order_rows)}
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [
+            self.index(new_rows[index.row()], index.column()) for index in persistent
+        ])
+        
+        self.layoutChanged.emit()
+    
+    def _sorted_order(self) -> List[int]:
+        """按当前排序列计算行的排列（稳定排序）"""
+        keys = self._columns[self._sort_column]
+        return sorted(
+            range(len(keys)),
+            key=keys.__getitem__,
+            reverse=self._sort_order == Qt.SortOrder.DescendingOrder
+        )
+    
+    def _apply_order(self, order_rows: List[int]):
+        """按排列重排账号及所有列"""
+        self._accounts = [self._accounts[i] for i in order_rows]
+        self._columns = [[col[i] for i in order_rows] for col in self._columns]
+        self._reindex_rows()
+
+
+class StatusDelegate(QStyledItemDelegate):
+    """按模型提供的状态代码为状态列着色"""
+    
+    def initStyleOption(self, option, index: QModelIndex):
+        super().initStyleOption(option, index)
+        code = index.data(AccountTableModel.STATUS_CODE_ROLE)
+        if code is not None:
+            option.backgroundBrush = _STATUS_BG[code]
+            option.palette.setBrush(QPalette.ColorRole.Text, _STATUS_FG[code])
+
+
+class AccountButtonDelegate(QStyledItemDelegate):
+    """在单元格内直接绘制按钮，不为每行创建QPushButton控件"""
+    
+    button_clicked = pyqtSignal(str, int)  # (动作, 行号)
+    
+    # 动作 -> (文本, 背景色, 悬停色, 文字色, 是否加粗)
+    BUTTON_STYLES = {
+        "edit": ("编辑", QColor("#007bff"), QColor("#0056b3"), QColor("white"), False),
+        "delete": ("删除", QColor("#dc3545"), QColor("#c82333"), QColor("white"), False),
+        "test": ("测试", QColor("#ffc107"), QColor("#e0a800"), QColor("#212529"), True),
+    }
+    
+    def __init__(self, actions: List[str], parent=None):
+        super().__init__(parent)
+        self.actions = actions
+        self._fonts: Dict[bool, QFont] = {}  # 是否加粗 -> 按钮字体，首次绘制时创建
+    
+    def _button_font(self, base: QFont, bold: bool) -> QFont:
+        """获取按钮字体（复用已创建的字体对象）"""
+        font = self._fonts.get(bold)
+        if font is None:
+            font = QFont(base)
+            font.setPixelSize(12)
+            font.setBold(bold)
+            self._fonts[bold] = font
+        return font
+    
+    def _button_rects(self, rect: QRect) -> List[QRect]:
+        """计算单元格内各按钮区域"""
+        spacing = 2
+        inner = rect.adjusted(2, 2, -2, -2)
+        count = len(self.actions)
+        width = (inner.width() - spacing * (count - 1)) // count
+        return [
+            QRect(inner.left() + i * (width + spacing), inner.top(), width, inner.height())
+            for i in range(count)
+        ]
+    
+    def paint(self, painter: QPainter, option, index: QModelIndex):
+        super().paint(painter, option, index)
+        
+        cursor_pos = None
+        view = self.parent()
+        if option.state & QStyle.StateFlag.State_MouseOver and view is not None:
+            cursor_pos = view.viewport().mapFromGlobal(QCursor.pos())
+        
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for action, rect in zip(self.actions, self._button_rects(option.rect)):
+            text, bg, hover_bg, fg, bold = self.BUTTON_STYLES[action]
+            hovered = cursor_pos is not None and rect.contains(cursor_pos)
+            
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(hover_bg if hovered else bg)
+            painter.drawRoundedRect(QRectF(rect), 3, 3)
+            
+            painter.setFont(self._button_font(option.font, bold))
+            painter.setPen(fg)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        view = self.parent()
+        if event.type() == QEvent.Type.MouseMove and view is not None:
+            # 刷新悬停效果
+            view.viewport().update(option.rect)
+        elif (event.type() == QEvent.Type.MouseButtonRelease
+              and event.button() == Qt.MouseButton.LeftButton):
+            pos = event.position().toPoint()
+            for action, rect in zip(self.actions, self._button_rects(option.rect)):
+                if rect.contains(pos):
+                    self.button_clicked.emit(action, index.row())
+                    return True
+        return super().editorEvent(event, model, option, index)
 
 
 class AccountTab(QWidget):
@@ -26,10 +320,15 @@ class AccountTab(QWidget):
     # 信号定义
     account_selected = pyqtSignal(str)      # 账号被选中
     login_requested = pyqtSignal(str)       # 请求登录
+    _log_requested = pyqtSignal(str)        # 日志追加（可从工作线程发出）
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.accounts = []  # 账号列表
+        self._by_name: Dict[str, dict] = {}  # 账号名称 -> 账号数据
+        self._saved_digest: Optional[bytes] = None  # 上次写入accounts.json的内容摘要
+        self._accounts_dirty = False  # 是否有未写入的账号修改
+        self._flush_scheduled = False
         self.current_account = None  # 当前选中的账号
         
         self.setup_ui()
@@ -96,7 +395,9 @@ class AccountTab(QWidget):
     def create_account_table(self, parent_layout):
         """创建账号表格"""
         # 表格
-        self.account_table = QTableWidget()
+        self.account_table = QTableView()
+        self.account_model = AccountTableModel(self)
+        self.account_table.setModel(self.account_model)
         self.setup_table()
         parent_layout.addWidget(self.account_table)
     
@@ -110,85 +411,122 @@ class AccountTab(QWidget):
         self.operation_log.setPlaceholderText("账号相关操作日志将在这里显示...")
         self.operation_log.setReadOnly(True)
         self.operation_log.setFont(QFont("Monaco", 10))  # 使用 Monaco 等宽字体
+        self.operation_log.document().setMaximumBlockCount(2000)  # 限制日志行数
         log_group_layout.addWidget(self.operation_log)
         
+        # 复用同一个文档光标追加日志
+        self._log_cursor = QTextCursor(self.operation_log.document())
+        
+        # 日志缓冲，50ms内的多条日志合并为一次追加
+        self._log_buffer: List[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(50)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        self._log_requested.connect(self._buffer_log)
+        
         parent_layout.addWidget(log_group)
     
     def setup_table(self):
         """设置表格"""
-        # 设置列
-        headers = ["平台", "账号名称", "状态", "最后登录时间", "备注", "操作", "测试"]
-        self.account_table.setColumnCount(len(headers))
-        self.account_table.setHorizontalHeaderLabels(headers)
-        
         # 设置表格属性
         self.account_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.account_table.setAlternatingRowColors(True)
+        # 用户点击表头前不排序，避免每次加载都按第一列重排
+        self.account_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.account_table.setSortingEnabled(True)
+        self.account_table.setMouseTracking(True)  # 按钮悬停效果
+        
+        # 状态列着色及按钮列由委托绘制
+        self.status_delegate = StatusDelegate(self.account_table)
+        self.account_table.setItemDelegateForColumn(2, self.status_delegate)
+        self.action_delegate = AccountButtonDelegate(["edit", "delete"], self.account_table)
+        self.test_delegate = AccountButtonDelegate(["test"], self.account_table)
+        self.account_table.setItemDelegateForColumn(AccountTableModel.ACTION_COLUMN, self.action_delegate)
+        self.account_table.setItemDelegateForColumn(AccountTableModel.TEST_COLUMN, self.test_delegate)
+        self.action_delegate.button_clicked.connect(self.on_row_button_clicked)
+        self.test_delegate.button_clicked.connect(self.on_row_button_clicked)
         
         # 设置列宽
         header = self.account_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)  # 平台
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # 账号名称
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)  # 状态
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # 最后登录时间
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # 备注
+        
+        # 平台/状态/最后登录时间按典型内容一次算好宽度，不随每次刷新测量所有单元格
+        fm = self.account_table.fontMetrics()
+        for column, samples in ((0, ["平台", "小红书"]),
+                                (2, ["状态", "登录有效", "未测试"]),
+                                (3, ["最后登录时间", "2000-01-01 00:00"])):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(column, max(fm.horizontalAdvance(t) for t in samples) + 24)
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)  # 操作
         header.setSectionResizeMode(6, QHeaderView.ResizeMode.Fixed)  # 测试
         header.resizeSection(5, 120)
         header.resizeSection(6, 80)
         
         # 连接选择变化信号
-        self.account_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.account_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
     
     def load_accounts(self):
         """加载账号列表"""
         try:
             accounts_file = Path("accounts.json")
             if accounts_file.exists():
-                with open(accounts_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.accounts = data.get('accounts', [])
+                data = json_loads(accounts_file.read_text(encoding='utf-8'))
+                self.accounts = data.get('accounts', [])
             
             # 如果没有账号，创建默认账号
             if not self.accounts:
-                self.accounts = [
-                    {
-                        "name": "默认账号",
-                        "platform": "小红书",
-                        "status": "未测试",
-                        "last_login": "",
-                        "notes": "test",
-                        "created_time": datetime.now().isoformat()
-                    }
-                ]
+                self.accounts = [self._default_account()]
                 self.save_accounts()
             
+            self._rebuild_account_index()
             self.update_table()
             self.add_log("账号列表加载完成")
             
         except Exception as e:
             logger.error(f"加载账号失败: {e}")
             # 创建默认账号
-            self.accounts = [
-                {
-                    "name": "默认账号", 
-                    "platform": "小红书",
-                    "status": "未测试",
-                    "last_login": "",
-                    "notes": "test",
-                    "created_time": datetime.now().isoformat()
-                }
-            ]
+            self.accounts = [self._default_account()]
+            self._rebuild_account_index()
             self.update_table()
             self.add_log("创建默认账号")
     
+    @staticmethod
+    def _default_account() -> dict:
+        """默认账号数据"""
+        return {
+            "name": "默认账号",
+            "platform": "小红书",
+            "status": "未测试",
+            "last_login": "",
+            "notes": "test",
+            "created_time": datetime.now().isoformat()
+        }
+    
+    def _rebuild_account_index(self):
+        """重建账号名称索引"""
+        self._by_name = {acc['name']: acc for acc in self.accounts}
+    
     def save_accounts(self):
-        """保存账号列表"""
+        """保存账号列表（短时间内的多次保存合并为一次写入）"""
+        self._accounts_dirty = True
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(500, self.flush_accounts)
+    
+    def flush_accounts(self):
+        """写入尚未保存的账号修改"""
+        self._flush_scheduled = False
+        if not self._accounts_dirty:
+            return
+        self._accounts_dirty = False
+        
         try:
             accounts_file = Path("accounts.json")
-            with open(accounts_file, 'w', encoding='utf-8') as f:
-                json.dump({"accounts": self.accounts}, f, ensure_ascii=False, indent=2)
+            self._saved_digest = write_json_atomic(
+                accounts_file, {"accounts": self.accounts}, self._saved_digest
+            )
         except Exception as e:
             logger.error(f"保存账号失败: {e}")
     
@@ -206,130 +544,23 @@ class AccountTab(QWidget):
     
     def update_table(self):
         """更新表格显示"""
-        self.account_table.setRowCount(len(self.accounts))
-        
-        for row, account in enumerate(self.accounts):
-            # 平台
-            platform_item = QTableWidgetItem(account['platform'])
-            self.account_table.setItem(row, 0, platform_item)
-            
-            # 账号名称
-            name_item = QTableWidgetItem(account['name'])
-            name_item.setData(Qt.ItemDataRole.UserRole, account)  # 存储完整账号数据
-            self.account_table.setItem(row, 1, name_item)
-            
-            # 状态
-            status_item = QTableWidgetItem(account.get('status', '未测试'))
-            # 根据状态设置颜色
-            status = account.get('status', '未测试')
-            if '有效' in status:
-                status_item.setBackground(QBrush(QColor("#d4edda")))
-                status_item.setForeground(QBrush(QColor("#155724")))
-            elif '失效' in status or '失败' in status:
-                status_item.setBackground(QBrush(QColor("#f8d7da")))
-                status_item.setForeground(QBrush(QColor("#721c24")))
-            else:
-                status_item.setBackground(QBrush(QColor("#fff3cd")))
-                status_item.setForeground(QBrush(QColor("#856404")))
-            self.account_table.setItem(row, 2, status_item)
-            
-            # 最后登录时间
-            last_login = account.get('last_login', '')
-            if last_login:
-                # 格式化时间显示
-                try:
-                    if 'T' in last_login:  # ISO格式
-                        dt = datetime.fromisoformat(last_login.replace('Z', '+00:00'))
-                        formatted_time = dt.strftime("%Y-%m-%d %H:%M")
-                    else:
-                        formatted_time = last_login
-                except:
-                    formatted_time = last_login
-            else:
-                formatted_time = ""
-            
-            time_item = QTableWidgetItem(formatted_time)
-            self.account_table.setItem(row, 3, time_item)
-            
-            # 备注
-            notes_item = QTableWidgetItem(account.get('notes', ''))
-            self.account_table.setItem(row, 4, notes_item)
-            
-            # 操作按钮
-            self.create_action_buttons(row, account)
-            
-            # 测试按钮
-            self.create_test_button(row, account)
-    
-    def create_action_buttons(self, row: int, account: dict):
-        """创建操作按钮"""
-        button_widget = QWidget()
-        button_layout = QHBoxLayout(button_widget)
-        button_layout.setContentsMargins(2, 2, 2, 2)
-        button_layout.setSpacing(2)
-        
-        # 编辑按钮
-        edit_btn = QPushButton("编辑")
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #007bff;
-                color: white;
-                border: none;
-                padding: 4px 8px;
-                border-radius: 3px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #0056b3;
-            }
-        """)
-        edit_btn.clicked.connect(lambda: self.edit_account(account))
-        button_layout.addWidget(edit_btn)
-        
-        # 删除按钮
-        delete_btn = QPushButton("删除")
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                border: none;
-                padding: 4px 8px;
-                border-radius: 3px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-        """)
-        delete_btn.clicked.connect(lambda: self.delete_account(account))
-        button_layout.addWidget(delete_btn)
-        
-        self.account_table.setCellWidget(row, 5, button_widget)
+        self.account_model.set_accounts(self.accounts)
     
-    def create_test_button(self, row: int, account: dict):
-        """创建测试按钮"""
-        test_btn = QPushButton("测试")
-        test_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ffc107;
-                color: #212529;
-                border: none;
-                padding: 4px 8px;
-                border-radius: 3px;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #e0a800;
-            }
-        """)
-        test_btn.clicked.connect(lambda: self.test_account(account))
-        self.account_table.setCellWidget(row, 6, test_btn)
+    def on_row_button_clicked(self, action: str, row: int):
+        """行内按钮点击处理"""
+        account = self.account_model.account_at(row)
+        if not account:
+            return
+        
+        if action == "edit":
+            self.edit_account(account)
+        elif action == "delete":
+            self.delete_account(account)
+        elif action == "test":
+            self.test_account(account)
     
     def add_account(self):
         """添加账号"""
-        from PyQt6.QtWidgets import QDialog, QDialogButtonBox
-        
         dialog = QDialog(self)
         dialog.setWindowTitle("添加账号")
         dialog.setModal(True)
@@ -367,7 +598,7 @@ class AccountTab(QWidget):
                 return
             
             # 检查重复
-            if any(acc['name'] == account_name for acc in self.accounts):
+            if account_name in self._by_name:
                 QMessageBox.warning(self, "错误", "账号名称已存在")
                 return
             
@@ -382,8 +613,9 @@ class AccountTab(QWidget):
             }
             
             self.accounts.append(new_account)
+            self._by_name[account_name] = new_account
             self.save_accounts()
-            self.update_table()
+            self.account_model.append_account(new_account)
             
             self.add_log(f"添加账号: {account_name}")
             
@@ -408,9 +640,11 @@ class AccountTab(QWidget):
         
         if reply == QMessageBox.StandardButton.Yes:
             # 删除账号
-            self.accounts = [acc for acc in self.accounts if acc['name'] != account['name']]
+            self._by_name.pop(account['name'], None)
+            self.accounts = list(self._by_name.values())
             self.save_accounts()
-            self.update_table()
+            if not self.account_model.remove_account(account):
+                self.update_table()
             
             self.add_log(f"删除账号: {account['name']}")
             
@@ -420,18 +654,46 @@ class AccountTab(QWidget):
         """测试账号登录状态"""
         logger.info(f"🔐 测试账号登录状态: {account['name']}")
         self.add_log(f"测试账号登录状态: {account['name']}")
+        # 测试进程会读写accounts.json，先写入待保存的修改
+        self.flush_accounts()
         self.login_requested.emit(account['name'])
     
+    def on_test_finished(self, account_name: str, success: bool):
+        """账号测试结束（测试进程已更新accounts.json，结果日志由主窗口写入）"""
+        # 只同步被测试账号的状态，其余行不需要重建
+        if not self._reload_account(account_name):
+            self.refresh_accounts()
+    
+    def _reload_account(self, account_name: str) -> bool:
+        """从accounts.json重新读取单个账号的测试结果"""
+        account = self._by_name.get(account_name)
+        if account is None:
+            return False
+        
+        try:
+            data = json_loads(Path("accounts.json").read_text(encoding='utf-8'))
+            saved = next((acc for acc in data.get('accounts', [])
+                          if acc.get('name') == account_name), None)
+            if saved is None:
+                return False
+            
+            account['status'] = saved.get('status', account.get('status', '未测试'))
+            account['last_login'] = saved.get('last_login', account.get('last_login', ''))
+            return self.account_model.update_account(account)
+        except Exception as e:
+            logger.error(f"读取账号测试结果失败: {e}")
+            return False
+    
     def refresh_accounts(self):
         """刷新账号列表"""
+        self.flush_accounts()
         self.load_accounts()
         self.add_log("刷新账号列表")
     
     def on_selection_changed(self):
         """选择变化处理"""
-        current_row = self.account_table.currentRow()
-        if current_row >= 0 and current_row < len(self.accounts):
-            account = self.accounts[current_row]
+        account = self.account_model.account_at(self.account_table.currentIndex().row())
+        if account:
             self.current_account = account['name']
             
             # 发出信号
@@ -446,20 +708,44 @@ class AccountTab(QWidget):
         if not self.current_account:
             return "小红书"
         
-        account = next((acc for acc in self.accounts if acc['name'] == self.current_account), None)
+        account = self._by_name.get(self.current_account)
         return account['platform'] if account else "小红书"
     
     def add_log(self, message: str):
         """添加日志信息"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        self.operation_log.append(f"[{timestamp}] {message}")
+        # 经信号转到界面线程处理，工作线程中调用也安全
+        self._log_requested.emit(f"[{timestamp}] {message}")
+    
+    def _buffer_log(self, line: str):
+        """缓冲日志行，稍后统一写入"""
+        self._log_buffer.append(line)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+    
+    def _flush_log(self):
+        """将缓冲的日志一次性写入日志区域"""
+        if not self._log_buffer:
+            return
+        
+        scrollbar = self.operation_log.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        
+        text = "\n".join(self._log_buffer)
+        self._log_buffer.clear()
+        
+        cursor = self._log_cursor
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.operation_log.document().isEmpty():
+            text = "\n" + text
+        cursor.insertText(text)
         
-        # 自动滚动到底部
-        cursor = self.operation_log.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.operation_log.setTextCursor(cursor)
+        # 用户未向上翻看时才自动滚动到底部
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
     
     def clear_log(self):
         """清空日志"""
+        self._log_buffer.clear()
         self.operation_log.clear()
         self.add_log("日志已清空")
\ No newline at end of file
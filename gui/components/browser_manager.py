@@ -1,81 +1,24 @@
 """
 浏览器管理组件
 """
-import os
+import re
 import sys
-import subprocess
 from pathlib import Path
+from typing import Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QProgressBar, QGroupBox, QMessageBox
 )
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, QTimer
+from PyQt6.QtCore import QProcess, QProcessEnvironment, QTimer
 from loguru import logger
 
 
-class BrowserDownloadThread(QThread):
-    """浏览器下载线程"""
-    progress = pyqtSignal(int, str)
-    finished = pyqtSignal(bool, str)
-    
-    def __init__(self, browser_type="firefox"):
-        super().__init__()
-        self.browser_type = browser_type
-        
-    def run(self):
-        """执行下载"""
-        try:
-            self.progress.emit(0, "正在准备下载...")
-            
-            # 使用默认路径，不设置自定义路径
-            # 这样浏览器会下载到 Playwright 的默认位置
-            env = os.environ.copy()
-            
-            # 移除可能存在的自定义路径环境变量
-            if 'PLAYWRIGHT_BROWSERS_PATH' in env:
-                del env['PLAYWRIGHT_BROWSERS_PATH']
-            
-            self.progress.emit(20, "使用 Playwright 默认下载路径...")
-            
-            # 构建命令
-            cmd = [sys.executable, "-m", "playwright", "install", self.browser_type]
-            
-            self.progress.emit(40, f"开始下载 {self.browser_type}...")
-            
-            # 执行下载
-            process = subprocess.Popen(
-                cmd,
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
-            )
-            
-            # 读取输出
-            for line in process.stdout:
-                line = line.strip()
-                if line:
-                    # 不要将playwright的输出记录到日志，避免日志混乱
-                    # 简单的进度估算
-                    if "Downloading" in line:
-                        self.progress.emit(60, "正在下载浏览器文件...")
-                    elif "Installing" in line:
-                        self.progress.emit(80, "正在安装浏览器...")
-                    elif "browser" in line.lower() and "installed" in line.lower():
-                        self.progress.emit(90, "浏览器安装中...")
-            
-            process.wait()
-            
-            if process.returncode == 0:
-                self.progress.emit(100, "浏览器下载安装完成！")
-                self.finished.emit(True, f"{self.browser_type} 浏览器已成功安装")
-            else:
-                self.finished.emit(False, f"下载失败，返回码: {process.returncode}")
-                
-        except Exception as e:
-            logger.error(f"下载浏览器失败: {e}")
-            self.finished.emit(False, str(e))
+# playwright install 输出中的阶段标记 -> (进度, 提示)，按出现先后排列
+_DOWNLOAD_STAGES = [
+    (re.compile(rb"Downloading"), 60, "正在下载浏览器文件..."),
+    (re.compile(rb"Installing"), 80, "正在安装浏览器..."),
+    (re.compile(rb"browser[^\r\n]*installed", re.IGNORECASE), 90, "浏览器安装中..."),
+]
 
 
 class BrowserManager(QGroupBox):
@@ -83,7 +26,9 @@ class BrowserManager(QGroupBox):
     
     def __init__(self, parent=None):
         super().__init__("浏览器管理", parent)
-        self.download_thread = None
+        self.download_process: Optional[QProcess] = None
+        self._download_progress = 0
+        self._output_tail = b""  # 上次输出的末尾，避免标记被截断
         self.setup_ui()
         # 延迟检查浏览器状态，避免初始化时的问题
         QTimer.singleShot(100, self.check_browser_status)
@@ -134,6 +79,13 @@ class BrowserManager(QGroupBox):
             win_info.setStyleSheet("color: #666; font-size: 11px;")
             layout.addWidget(win_info)
             
+    def _has_firefox(self, root: Path) -> bool:
+        """检查目录下是否有Firefox"""
+        if not root.exists():
+            return False
+        # 找到第一个即停止，不需要列出全部匹配
+        return next(root.glob("firefox-*/firefox*"), None) is not None
+    
     def check_browser_status(self):
         """检查浏览器状态"""
         try:
@@ -153,18 +105,14 @@ class BrowserManager(QGroupBox):
             firefox_found = False
             
             # 先检查自定义路径
-            if custom_path.exists():
-                firefox_paths = list(custom_path.glob("firefox-*/firefox*"))
-                if firefox_paths:
-                    firefox_found = True
-                    logger.debug(f"在自定义路径找到Firefox: {custom_path}")
+            if self._has_firefox(custom_path):
+                firefox_found = True
+                logger.debug(f"在自定义路径找到Firefox: {custom_path}")
             
             # 再检查默认路径
-            if not firefox_found and default_path.exists():
-                firefox_paths = list(default_path.glob("firefox-*/firefox*"))
-                if firefox_paths:
-                    firefox_found = True
-                    logger.debug(f"在默认路径找到Firefox: {default_path}")
+            if not firefox_found and self._has_firefox(default_path):
+                firefox_found = True
+                logger.debug(f"在默认路径找到Firefox: {default_path}")
             
             if firefox_found:
                 self.status_label.setText("✅ 已安装")
@@ -182,7 +130,8 @@ class BrowserManager(QGroupBox):
             
     def download_browser(self):
         """下载浏览器"""
-        if self.download_thread and self.download_thread.isRunning():
+        if (self.download_process and
+                self.download_process.state() != QProcess.ProcessState.NotRunning):
             QMessageBox.warning(self, "提示", "浏览器正在下载中，请稍候...")
             return
             
@@ -203,10 +152,66 @@ class BrowserManager(QGroupBox):
         self.progress_bar.setVisible(True)
         self.progress_label.setVisible(True)
         
-        self.download_thread = BrowserDownloadThread("firefox")
-        self.download_thread.progress.connect(self.update_progress)
-        self.download_thread.finished.connect(self.download_finished)
-        self.download_thread.start()
+        browser_type = "firefox"
+        self.update_progress(0, "正在准备下载...")
+        
+        # 使用 Playwright 默认下载路径，移除可能存在的自定义路径环境变量
+        env = QProcessEnvironment.systemEnvironment()
+        env.remove('PLAYWRIGHT_BROWSERS_PATH')
+        self.update_progress(20, "使用 Playwright 默认下载路径...")
+        
+        # QProcess在事件循环中异步读取输出，不需要单独的线程
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        process.setProcessEnvironment(env)
+        process.readyReadStandardOutput.connect(self._on_download_output)
+        process.finished.connect(
+            lambda exit_code, exit_status: self._on_download_process_finished(
+                browser_type, exit_code, exit_status)
+        )
+        process.errorOccurred.connect(self._on_download_error)
+        self.download_process = process
+        self._download_progress = 40
+        self._output_tail = b""
+        
+        self.update_progress(40, f"开始下载 {browser_type}...")
+        process.start(sys.executable, ["-m", "playwright", "install", browser_type])
+    
+    def _on_download_output(self):
+        """解析下载进程输出，估算进度"""
+        # 不要将playwright的输出记录到日志，避免日志混乱
+        text = self._output_tail + bytes(self.download_process.readAllStandardOutput())
+        self._output_tail = text[-64:]
+        # 每个阶段只更新一次进度
+        for pattern, value, message in _DOWNLOAD_STAGES:
+            if value > self._download_progress and pattern.search(text):
+                self._download_progress = value
+                self.update_progress(value, message)
+    
+    def _on_download_process_finished(self, browser_type: str, exit_code: int,
+                                      exit_status: QProcess.ExitStatus):
+        """下载进程结束"""
+        self._cleanup_download_process()
+        if exit_status == QProcess.ExitStatus.NormalExit and exit_code == 0:
+            self.update_progress(100, "浏览器下载安装完成！")
+            self.download_finished(True, f"{browser_type} 浏览器已成功安装")
+        else:
+            self.download_finished(False, f"下载失败，返回码: {exit_code}")
+    
+    def _on_download_error(self, error: QProcess.ProcessError):
+        """下载进程启动失败"""
+        if error != QProcess.ProcessError.FailedToStart or not self.download_process:
+            return  # 其他错误由finished信号处理
+        message = self.download_process.errorString()
+        logger.error(f"下载浏览器失败: {message}")
+        self._cleanup_download_process()
+        self.download_finished(False, message)
+    
+    def _cleanup_download_process(self):
+        """释放下载进程对象"""
+        if self.download_process:
+            self.download_process.deleteLater()
+            self.download_process = None
         
     def update_progress(self, value: int, message: str):
         """更新进度"""
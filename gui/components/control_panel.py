@@ -2,20 +2,52 @@
 控制面板组件
 包含文件操作、发布控制、状态显示等功能
 """
-import sys
 from pathlib import Path
 from typing import Optional
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QGroupBox, QPushButton,
     QLabel, QProgressBar, QFileDialog, QMessageBox
 )
-from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QTimer
 from loguru import logger
 
-# 添加core模块路径
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from core.models import PublishTask, TaskStatus
+
+# 面板样式表：按钮公共样式只作用于带 role 属性的按钮（不影响以面板为父窗口的对话框），
+# 各按钮通过 role 属性选择颜色（正常、悬停、按下）
+_BUTTON_COLORS = {
+    "import": ("#28a745", "#218838", "#1e7e34"),
+    "sample": ("#6f42c1", "#5a32a3", "#512b92"),
+    "clear": ("#dc3545", "#c82333", "#bd2130"),
+    "publish": ("#007bff", "#0056b3", "#004085"),
+    "stop": ("#fd7e14", "#e8690b", "#d35400"),
+    "refresh": ("#6c757d", "#5a6268", "#495057"),
+}
+
+_PANEL_QSS = """
+QLabel#stats_label { color: #495057; }
+QLabel#storage_label { color: #28a745; font-weight: bold; }
+QPushButton[role] {
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+    min-width: 120px;
+}
+""" + "".join(
+    f"QPushButton[role=\"{role}\"] {{ background-color: {normal}; }}\n"
+    f"QPushButton[role=\"{role}\"]:hover {{ background-color: {hover}; }}\n"
+    f"QPushButton[role=\"{role}\"]:pressed {{ background-color: {pressed}; }}\n"
+    for role, (normal, hover, pressed) in _BUTTON_COLORS.items()
+)
+
+_YES_NO = QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+
+# 状态标签样式（预先定义，避免每次拼接）
+_QSS_OK = "color: #28a745; font-weight: bold;"
+_QSS_ERROR = "color: #dc3545; font-weight: bold;"
+_QSS_NEUTRAL = "color: #6c757d; font-weight: bold;"
+_STATUS_QSS = {"运行中": _QSS_OK, "已停止": _QSS_ERROR, "错误": _QSS_ERROR}
 
 
 class ControlPanel(QWidget):
@@ -32,8 +64,23 @@ class ControlPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.scheduler = None  # 调度器引用，由父组件设置
+        self.import_excel_btn: Optional[QPushButton] = None  # 由setup_ui创建
+        self._running = False  # 调度器是否运行中
+        self._stats: Optional[dict] = None  # 最近一次收到的任务统计
+        self._pending_stats: Optional[dict] = None  # 尚未显示的任务统计
+        self._pending_running: Optional[bool] = None  # 尚未显示的运行状态
+        self._shown_running: Optional[bool] = None  # 标签上当前显示的运行状态
+        self._shown_stats_key: Optional[tuple] = None  # 标签上当前显示的统计
+        self._last_import_dir = ""  # 上次导入Excel所在目录
+        # 先设置面板样式表再创建子控件，子控件只需在首次显示时解析一次样式
+        self.setStyleSheet(_PANEL_QSS)
         self.setup_ui()
-        self.setup_status_timer()
+        
+        # 状态推送可能很密集（批量导入、连续发布），80ms内的更新合并为一次显示
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(80)
+        self._flush_timer.timeout.connect(self._flush_status)
         
     def setup_ui(self):
         """设置界面"""
@@ -62,67 +109,26 @@ class ControlPanel(QWidget):
         # 导入Excel按钮 - 绿色
         self.import_excel_btn = QPushButton("📂 导入Excel")
         self.import_excel_btn.clicked.connect(self.on_import_excel)
-        self.import_excel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #28a745;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-            QPushButton:pressed {
-                background-color: #1e7e34;
-            }
-        """)
+        self.import_excel_btn.setProperty("role", "import")
         layout.addWidget(self.import_excel_btn)
         
+        # 导入进度条 - 仅在导入期间显示
+        self.import_progress_bar = QProgressBar()
+        self.import_progress_bar.setRange(0, 100)
+        self.import_progress_bar.setFixedWidth(100)
+        self.import_progress_bar.setVisible(False)
+        layout.addWidget(self.import_progress_bar)
+        
         # 添加示例按钮 - 紫色
         self.add_sample_btn = QPushButton("📝 添加示例")
         self.add_sample_btn.clicked.connect(self.on_add_sample_tasks)
-        self.add_sample_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6f42c1;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #5a32a3;
-            }
-            QPushButton:pressed {
-                background-color: #512b92;
-            }
-        """)
+        self.add_sample_btn.setProperty("role", "sample")
         layout.addWidget(self.add_sample_btn)
         
         # 清空任务按钮 - 红色
         self.clear_tasks_btn = QPushButton("🗑️ 清空任务")
         self.clear_tasks_btn.clicked.connect(self.on_clear_all_tasks)
-        self.clear_tasks_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-            QPushButton:pressed {
-                background-color: #bd2130;
-            }
-        """)
+        self.clear_tasks_btn.setProperty("role", "clear")
         layout.addWidget(self.clear_tasks_btn)
         
         return group
@@ -135,67 +141,19 @@ class ControlPanel(QWidget):
         # 发布所有按钮
         self.publish_all_btn = QPushButton("🚀 发布所有")
         self.publish_all_btn.clicked.connect(self.on_publish_all)
-        self.publish_all_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #007bff;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #0056b3;
-            }
-            QPushButton:pressed {
-                background-color: #004085;
-            }
-        """)
+        self.publish_all_btn.setProperty("role", "publish")
         layout.addWidget(self.publish_all_btn)
         
         # 停止发布按钮
         self.stop_publish_btn = QPushButton("🛑 停止发布")
         self.stop_publish_btn.clicked.connect(self.on_stop_publishing)
-        self.stop_publish_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #fd7e14;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #e8690b;
-            }
-            QPushButton:pressed {
-                background-color: #d35400;
-            }
-        """)
+        self.stop_publish_btn.setProperty("role", "stop")
         layout.addWidget(self.stop_publish_btn)
         
         # 刷新状态按钮
         self.refresh_btn = QPushButton("🔄 刷新状态")
         self.refresh_btn.clicked.connect(self.on_refresh_status)
-        self.refresh_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #6c757d;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background-color: #5a6268;
-            }
-            QPushButton:pressed {
-                background-color: #495057;
-            }
-        """)
+        self.refresh_btn.setProperty("role", "refresh")
         layout.addWidget(self.refresh_btn)
         
         return group
@@ -209,7 +167,7 @@ class ControlPanel(QWidget):
         status_layout = QHBoxLayout()
         status_layout.addWidget(QLabel("📊 运行状态:"))
         self.status_label = QLabel("准备中...")
-        self.status_label.setStyleSheet("color: #6c757d; font-weight: bold;")
+        self.status_label.setStyleSheet(_QSS_NEUTRAL)
         status_layout.addWidget(self.status_label)
         status_layout.addStretch()
         layout.addLayout(status_layout)
@@ -218,7 +176,7 @@ class ControlPanel(QWidget):
         stats_layout = QHBoxLayout()
         stats_layout.addWidget(QLabel("📈 任务统计:"))
         self.stats_label = QLabel("总数: 0")
-        self.stats_label.setStyleSheet("color: #495057;")
+        self.stats_label.setObjectName("stats_label")
         stats_layout.addWidget(self.stats_label)
         stats_layout.addStretch()
         layout.addLayout(stats_layout)
@@ -227,59 +185,47 @@ class ControlPanel(QWidget):
         storage_layout = QHBoxLayout()
         storage_layout.addWidget(QLabel("💾 存储状态:"))
         self.storage_label = QLabel("正常")
-        self.storage_label.setStyleSheet("color: #28a745; font-weight: bold;")
+        self.storage_label.setObjectName("storage_label")
         storage_layout.addWidget(self.storage_label)
         storage_layout.addStretch()
         layout.addLayout(storage_layout)
         
         return group
     
-    def setup_status_timer(self):
-        """设置状态更新定时器"""
-        self.status_timer = QTimer(self)
-        self.status_timer.timeout.connect(self.update_status)
-        self.status_timer.start(2000)  # 每2秒更新一次状态
-    
     def set_scheduler(self, scheduler):
-        """设置调度器引用"""
+        """设置调度器引用，并订阅其状态推送（不再定时轮询）"""
         self.scheduler = scheduler
+        scheduler.statistics_changed.connect(self._apply_stats)
+        scheduler.running_changed.connect(self._apply_running)
         self.update_status()
     
     def on_import_excel(self):
         """导入Excel文件"""
-        file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getOpenFileName(
+        file_path, _ = QFileDialog.getOpenFileName(
             self,
             "选择Excel文件",
-            "",
+            self._last_import_dir,
             "Excel文件 (*.xlsx *.xls)"
         )
         
         if file_path:
+            self._last_import_dir = str(Path(file_path).parent)
             logger.info(f"📂 选择导入Excel文件: {file_path}")
             self.import_excel_requested.emit(file_path)
         
+    def _confirm(self, title: str, message: str) -> bool:
+        """弹出是/否确认框，用户选择“是”时返回True"""
+        return QMessageBox.question(self, title, message, _YES_NO) == QMessageBox.StandardButton.Yes
+    
     def on_add_sample_tasks(self):
         """添加示例任务"""
-        reply = QMessageBox.question(
-            self, "确认添加", 
-            "确定要添加3个示例任务吗？",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
+        if self._confirm("确认添加", "确定要添加3个示例任务吗？"):
             logger.info("📝 添加示例任务")
             self.add_sample_tasks_requested.emit()
     
     def on_clear_all_tasks(self):
         """清空所有任务"""
-        reply = QMessageBox.question(
-            self, "确认清空", 
-            "确定要清空所有任务吗？此操作不可撤销！",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
+        if self._confirm("确认清空", "确定要清空所有任务吗？此操作不可撤销！"):
             logger.info("🗑️ 清空所有任务")
             self.clear_all_tasks_requested.emit()
     
@@ -290,32 +236,19 @@ class ControlPanel(QWidget):
             return
             
         # 获取待发布任务数量
-        tasks = self.scheduler.get_all_tasks()
-        pending_tasks = [t for t in tasks if t.status == TaskStatus.PENDING]
+        pending_count = self.scheduler.get_pending_count()
         
-        if not pending_tasks:
+        if pending_count == 0:
             QMessageBox.information(self, "提示", "没有待发布的任务")
             return
         
-        reply = QMessageBox.question(
-            self, "确认发布", 
-            f"确定要发布 {len(pending_tasks)} 个待发布任务吗？",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            logger.info(f"🚀 开始发布所有任务 ({len(pending_tasks)}个)")
+        if self._confirm("确认发布", f"确定要发布 {pending_count} 个待发布任务吗？"):
+            logger.info(f"🚀 开始发布所有任务 ({pending_count}个)")
             self.publish_all_requested.emit()
     
     def on_stop_publishing(self):
         """停止发布"""
-        reply = QMessageBox.question(
-            self, "确认停止", 
-            "确定要停止当前的发布任务吗？",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
+        if self._confirm("确认停止", "确定要停止当前的发布任务吗？"):
             logger.info("🛑 停止发布")
             self.stop_publishing_requested.emit()
     
@@ -326,52 +259,119 @@ class ControlPanel(QWidget):
         self.update_status()
     
     def update_status(self):
-        """更新状态显示"""
+        """请求调度器推送当前状态"""
         if not self.scheduler:
             return
             
         try:
-            # 更新调度器状态
-            if self.scheduler.is_running:
-                self.status_label.setText("运行中")
-                self.status_label.setStyleSheet("color: #28a745; font-weight: bold;")
-            else:
-                self.status_label.setText("已停止")
-                self.status_label.setStyleSheet("color: #dc3545; font-weight: bold;")
-            
-            # 更新任务统计
-            stats = self.scheduler.get_task_statistics()
-            stats_text = f"总数: {stats['total']} (等待: {stats['pending']}, 执行中: {stats['running']}, 完成: {stats['completed']}, 失败: {stats['failed']})"
-            self.stats_label.setText(stats_text)
-            
-            # 更新按钮状态
-            has_pending = stats['pending'] > 0
-            has_running = stats['running'] > 0
-            
-            self.publish_all_btn.setEnabled(has_pending and self.scheduler.is_running)
-            self.stop_publish_btn.setEnabled(has_running)
-            
+            self.scheduler.emit_current_state()
         except Exception as e:
             logger.error(f"❌ 更新状态失败: {e}")
-            self.status_label.setText("错误")
-            self.status_label.setStyleSheet("color: #dc3545; font-weight: bold;")
+            self._set_status_label("错误")
+            self._shown_running = None
+    
+    @pyqtSlot(bool)
+    def _apply_running(self, running: bool):
+        """记录调度器运行状态，稍后统一显示"""
+        self._pending_running = running
+        self._schedule_flush()
+    
+    @pyqtSlot(dict)
+    def _apply_stats(self, stats: dict):
+        """记录任务统计，稍后统一显示"""
+        self._pending_stats = stats
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        # 面板不可见时只记录最新状态，等显示时再刷新
+        if self.isVisible() and not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def showEvent(self, event):
+        """面板显示时补上隐藏期间积累的状态"""
+        super().showEvent(event)
+        if self._pending_running is not None or self._pending_stats is not None:
+            self._schedule_flush()
+    
+    def _flush_status(self):
+        """显示最近一次收到的运行状态和任务统计"""
+        if self._pending_running is not None:
+            self._running = self._pending_running
+            self._pending_running = None
+        running_changed = self._running != self._shown_running
+        
+        stats_text = None
+        if self._pending_stats is not None:
+            stats = self._stats = self._pending_stats
+            self._pending_stats = None
+            # 统计未变化时不重新设置文本，避免无谓的重新布局
+            key = (stats['total'], stats['pending'], stats['running'],
+                   stats['completed'], stats['failed'])
+            if key != self._shown_stats_key:
+                self._shown_stats_key = key
+                stats_text = f"总数: {stats['total']} (等待: {stats['pending']}, 执行中: {stats['running']}, 完成: {stats['completed']}, 失败: {stats['failed']})"
+        
+        button_changes = self._button_changes()
+        changes = int(running_changed) + (stats_text is not None) + len(button_changes)
+        if changes == 0:
+            return
+        
+        # 多个控件同时变化时暂停重绘，恢复后统一重绘一次
+        batch = changes > 1
+        if batch:
+            self.setUpdatesEnabled(False)
+        try:
+            if running_changed:
+                self._shown_running = self._running
+                self._set_status_label("运行中" if self._running else "已停止")
+            if stats_text is not None:
+                self.stats_label.setText(stats_text)
+            for button, enabled in button_changes:
+                button.setEnabled(enabled)
+        finally:
+            if batch:
+                self.setUpdatesEnabled(True)
+    
+    def _button_changes(self) -> list:
+        """根据统计和运行状态计算需要切换启用状态的按钮"""
+        if self._stats is None:
+            return []
+        has_pending = self._stats['pending'] > 0
+        has_running = self._stats['running'] > 0
+        
+        targets = (
+            (self.publish_all_btn, has_pending and self._running),
+            (self.stop_publish_btn, has_running),
+        )
+        return [(button, enabled) for button, enabled in targets
+                if button.isEnabled() != enabled]
     
     @pyqtSlot(str)
     def on_scheduler_status_changed(self, status: str):
         """调度器状态变化"""
+        self._set_status_label(status)
+        self._shown_running = None  # 标签已被直接改写
+    
+    def _set_status_label(self, status: str):
+        """设置运行状态标签，文本未变化时不重新应用样式"""
+        if self.status_label.text() == status:
+            return
         self.status_label.setText(status)
-        if status == "运行中":
-            self.status_label.setStyleSheet("color: #28a745; font-weight: bold;")
-        elif status == "已停止":
-            self.status_label.setStyleSheet("color: #dc3545; font-weight: bold;")
-        else:
-            self.status_label.setStyleSheet("color: #6c757d; font-weight: bold;")
+        self.status_label.setStyleSheet(_STATUS_QSS.get(status, _QSS_NEUTRAL))
     
     def set_import_enabled(self, enabled: bool):
         """设置导入按钮的启用状态"""
-        if hasattr(self, 'import_excel_btn'):
-            self.import_excel_btn.setEnabled(enabled)
-            if not enabled:
-                self.import_excel_btn.setText("📂 导入中...")
-            else:
-                self.import_excel_btn.setText("📂 导入Excel")
\ No newline at end of file
+        if self.import_excel_btn is None:
+            return
+        
+        self.import_excel_btn.setEnabled(enabled)
+        if not enabled:
+            self.import_excel_btn.setText("📂 导入中...")
+            self.import_progress_bar.setValue(0)
+        else:
+            self.import_excel_btn.setText("📂 导入Excel")
+        self.import_progress_bar.setVisible(not enabled)
+    
+    def set_import_progress(self, progress: int):
+        """更新导入进度（由导入线程的进度信号驱动）"""
+        self.import_progress_bar.setValue(progress)
\ No newline at end of file
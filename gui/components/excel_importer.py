@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 异步Excel导入器组件
-使用QThread实现真异步Excel处理，避免GUI阻塞
+使用线程池在后台处理Excel，避免GUI阻塞
 """
 import os
+import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
-from PyQt6.QtCore import QThread, QObject, pyqtSignal, QTimer
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, QTimer
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QFileDialog, QDateTimeEdit, QSpinBox,
                              QTextEdit, QProgressBar, QMessageBox, QFrame)
@@ -19,38 +21,110 @@ from core.models import PublishTask
 from utils.excel_importer import ExcelImporter
 
 
+# 界面样式表（模块加载时生成一次，各实例共用）
+def _button_qss(normal: str, hover: str, pressed: str, disabled_bg: Optional[str] = None) -> str:
+    """生成按钮样式表（正常、悬停、按下颜色，可选的禁用背景色）"""
+    qss = f"""
+    QPushButton {{
+        background-color: {normal};
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        border-radius: 4px;
+        font-weight: bold;
+    }}
+    QPushButton:hover {{
+        background-color: {hover};
+    }}
+    QPushButton:pressed {{
+        background-color: {pressed};
+    }}
+    """
+    if disabled_bg:
+        qss += f"""
+    QPushButton:disabled {{
+        background-color: {disabled_bg};
+        color: #7f8c8d;
+    }}
+    """
+    return qss
+
+
+_SELECT_BTN_QSS = _button_qss("#3498db", "#2980b9", "#21618c")
+_TEMPLATE_BTN_QSS = _button_qss("#9b59b6", "#8e44ad", "#7d3c98")
+_VALIDATE_BTN_QSS = _button_qss("#f39c12", "#e67e22", "#d35400", "#95a5a6")
+_IMPORT_BTN_QSS = _button_qss("#27ae60", "#229954", "#1e8449", "#95a5a6")
+_CANCEL_BTN_QSS = _button_qss("#e74c3c", "#c0392b", "#a93226", "#95a5a6")
+
+_FRAME_QSS = "QFrame { border: 1px solid #bdc3c7; border-radius: 5px; padding: 10px; }"
+
+_PROGRESS_QSS = """
+    QProgressBar {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        text-align: center;
+        background-color: #ecf0f1;
+    }
+    QProgressBar::chunk {
+        background-color: #3498db;
+        border-radius: 4px;
+    }
+"""
+
+_STATUS_TEXT_QSS = """
+    QTextEdit {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        background-color: #f8f9fa;
+        color: #2c3e50;
+        font-family: Consolas, monospace;
+    }
+"""
+
+
 class AsyncExcelImporter(QObject):
     """异步Excel导入器"""
     
     # 信号定义
     import_started = pyqtSignal()                                    # 开始导入
     import_progress = pyqtSignal(int, str)                          # 进度更新 (进度%, 消息)
-    import_completed = pyqtSignal(bool, str, list)                  # 导入完成 (成功, 消息, 任务列表)
+    # 任务列表用object类型传递：list类型的信号参数会被转换为QVariantList再转回，整表复制两次
+    import_completed = pyqtSignal(bool, str, object)                # 导入完成 (成功, 消息, 任务列表)
     validation_completed = pyqtSignal(bool, str)                    # 验证完成 (成功, 消息)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.excel_importer = ExcelImporter()
-        self.import_thread = None
+        # 专用线程池（单线程）：多次验证/导入复用同一个工作线程，也保证同一时间只解析一个文件
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self.import_worker = None
+        self.validate_worker = None
         self.is_importing = False
+        self.is_validating = False
         
     def validate_file_async(self, file_path: str):
-        """异步验证Excel文件"""
+        """异步验证Excel文件（在后台线程中读取，避免阻塞GUI）"""
         if self.is_importing:
             logger.warning("正在导入中，请稍后")
             return
-            
-        # 使用QTimer延迟执行，避免阻塞GUI
-        QTimer.singleShot(100, lambda: self._do_validation(file_path))
+        if self.is_validating:
+            logger.warning("正在验证中，请稍后")
+            return
+        
+        self.is_validating = True
+        self.validate_worker = ExcelValidateWorker(
+            file_path=file_path, importer=self.excel_importer
+        )
+        self.validate_worker.signals.validation_finished.connect(self.validation_completed)
+        self.validate_worker.signals.finished.connect(self._on_validate_worker_finished)
+        self._pool.start(self.validate_worker)
     
-    def _do_validation(self, file_path: str):
-        """执行验证"""
-        try:
-            is_valid, message = self.excel_importer.validate_file(file_path)
-            self.validation_completed.emit(is_valid, message)
-        except Exception as e:
-            logger.error(f"验证文件异常: {e}")
-            self.validation_completed.emit(False, f"验证异常: {e}")
+    def _on_validate_worker_finished(self):
+        """验证任务完成处理"""
+        self.is_validating = False
+        self.validate_worker = None
+        logger.debug("Excel验证任务已结束")
     
     def import_excel_async(self, file_path: str, start_time: Optional[datetime] = None, 
                           interval_minutes: int = 30):
@@ -62,21 +136,23 @@ class AsyncExcelImporter(QObject):
         self.is_importing = True
         self.import_started.emit()
         
-        # 创建导入线程
-        self.import_thread = ExcelImportThread(
+        # 创建导入任务
+        self.import_worker = ExcelImportWorker(
             file_path=file_path,
             start_time=start_time,
             interval_minutes=interval_minutes,
-            parent=self
+            importer=self.excel_importer
         )
         
         # 连接信号
-        self.import_thread.progress_updated.connect(self.import_progress.emit)
-        self.import_thread.import_finished.connect(self._on_import_finished)
-        self.import_thread.finished.connect(self._on_thread_finished)
-        
-        # 启动线程
-        self.import_thread.start()
+        signals = self.import_worker.signals
+        # 信号直接连接信号，由Qt转发，不经过Python层的emit调用
+        signals.progress_updated.connect(self.import_progress)
+        signals.import_finished.connect(self._on_import_finished)
+        signals.finished.connect(self._on_worker_finished)
+        
+        # 提交到线程池
+        self._pool.start(self.import_worker)
         logger.info(f"🚀 启动异步Excel导入: {file_path}")
     
     def _on_import_finished(self, success: bool, message: str, tasks: List[PublishTask]):
@@ -84,88 +160,140 @@ class AsyncExcelImporter(QObject):
         self.import_completed.emit(success, message, tasks)
         logger.info(f"📋 Excel导入完成: {message}")
     
-    def _on_thread_finished(self):
-        """线程完成处理"""
+    def _on_worker_finished(self):
+        """导入任务结束处理"""
         self.is_importing = False
-        if self.import_thread:
-            self.import_thread.deleteLater()
-            self.import_thread = None
-        logger.debug("Excel导入线程已清理")
+        self.import_worker = None
+        logger.debug("Excel导入任务已结束")
     
     def cancel_import(self):
         """取消导入"""
-        if self.import_thread and self.import_thread.isRunning():
-            self.import_thread.requestInterruption()
-            self.import_thread.wait(3000)  # 等待3秒
+        if self.import_worker and self.is_importing:
+            self.import_worker.cancel()
+            self._pool.waitForDone(3000)  # 等待3秒
             logger.info("Excel导入已取消")
 
 
-class ExcelImportThread(QThread):
-    """Excel导入线程"""
+class ExcelWorkerSignals(QObject):
+    """Excel后台任务的信号（QRunnable不是QObject，信号由此对象发出）"""
     
     progress_updated = pyqtSignal(int, str)                         # 进度更新
-    import_finished = pyqtSignal(bool, str, list)                  # 导入完成
+    import_finished = pyqtSignal(bool, str, object)                # 导入完成 (成功, 消息, 任务列表)
+    validation_finished = pyqtSignal(bool, str)                    # 验证完成
+    finished = pyqtSignal()                                         # 任务结束（无论成功、失败或取消）
+
+
+class ExcelValidateWorker(QRunnable):
+    """Excel验证任务"""
+    
+    def __init__(self, file_path: str, importer: Optional[ExcelImporter] = None):
+        super().__init__()
+        # 由AsyncExcelImporter持有引用直至结束，避免线程池删除仍被Python引用的对象
+        self.setAutoDelete(False)
+        self.signals = ExcelWorkerSignals()
+        self.file_path = file_path
+        self.excel_importer = importer or ExcelImporter()
+    
+    def run(self):
+        """线程执行函数"""
+        try:
+            is_valid, message = self.excel_importer.validate_header(self.file_path)
+            self.signals.validation_finished.emit(is_valid, message)
+        except Exception as e:
+            logger.error(f"验证文件异常: {e}")
+            self.signals.validation_finished.emit(False, f"验证异常: {e}")
+        finally:
+            self.signals.finished.emit()
+
+
+class ExcelImportWorker(QRunnable):
+    """Excel导入任务"""
     
     def __init__(self, file_path: str, start_time: Optional[datetime] = None,
-                 interval_minutes: int = 30, parent=None):
-        super().__init__(parent)
+                 interval_minutes: int = 30, importer: Optional[ExcelImporter] = None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ExcelWorkerSignals()
         self.file_path = file_path
         self.start_time = start_time
         self.interval_minutes = interval_minutes
-        self.excel_importer = ExcelImporter()
+        self.excel_importer = importer or ExcelImporter()
+        self._cancelled = False  # 是否已请求取消
+        self._last_progress = -1  # 上次发送的进度
+        self._last_emit_ns = 0  # 上次发送进度的时间
+    
+    def cancel(self):
+        """请求取消导入"""
+        self._cancelled = True
+    
+    def _emit_progress(self, progress: int, message: str, force: bool = False):
+        """发送进度信号：进度未变化或距上次不足16ms时跳过（force时只要求进度变化）"""
+        if progress == self._last_progress:
+            return
+        now = time.monotonic_ns()
+        if not force and now - self._last_emit_ns < 16_000_000:
+            return
+        self._last_progress = progress
+        self._last_emit_ns = now
+        self.signals.progress_updated.emit(progress, message)
     
     def run(self):
         """线程执行函数"""
         try:
             # 发送开始信号
-            self.progress_updated.emit(0, "开始导入Excel文件...")
-            
-            # 检查是否被中断
-            if self.isInterruptionRequested():
-                return
-            
-            # 验证文件
-            self.progress_updated.emit(10, "验证Excel文件...")
-            is_valid, message = self.excel_importer.validate_file(self.file_path)
-            if not is_valid:
-                self.import_finished.emit(False, message, [])
-                return
+            self._emit_progress(0, "开始导入Excel文件...", force=True)
             
-            # 检查是否被中断
-            if self.isInterruptionRequested():
+            # 检查是否被取消
+            if self._cancelled:
                 return
             
-            # 导入任务
-            self.progress_updated.emit(30, "解析Excel数据...")
+            # 导入任务（import_tasks在唯一一次解析结果上完成文件校验，无需预先单独验证）
+            self._emit_progress(10, "读取并校验Excel数据...", force=True)
             success, message, tasks = self.excel_importer.import_tasks(
                 self.file_path, 
                 self.start_time, 
-                self.interval_minutes
+                self.interval_minutes,
+                progress_callback=self._on_rows_processed
             )
             
-            # 检查是否被中断
-            if self.isInterruptionRequested():
+            # 检查是否被取消
+            if self._cancelled:
                 return
             
             # 完成导入
-            self.progress_updated.emit(100, f"导入完成: {message}")
-            self.import_finished.emit(success, message, tasks)
+            self._emit_progress(100, f"导入完成: {message}", force=True)
+            self.signals.import_finished.emit(success, message, tasks)
             
         except Exception as e:
             logger.error(f"Excel导入线程异常: {e}")
-            self.import_finished.emit(False, f"导入异常: {e}", [])
+            self.signals.import_finished.emit(False, f"导入异常: {e}", [])
+        finally:
+            self.signals.finished.emit()
+    
+    def _on_rows_processed(self, done: int, total: int):
+        """创建任务阶段的进度（映射到30%~95%）"""
+        if total > 0:
+            self._emit_progress(30 + done * 65 // total, f"创建任务 {done}/{total}...")
 
 
 class ExcelImportWidget(QWidget):
     """Excel导入界面组件"""
     
     # 信号定义
-    tasks_imported = pyqtSignal(list)  # 任务导入完成 (任务列表)
+    tasks_imported = pyqtSignal(object)  # 任务导入完成 (任务列表)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.async_importer = AsyncExcelImporter(self)
         self.selected_file = ""
+        
+        # 状态信息先缓冲，50ms内的多条消息合并为一次追加
+        self._status_buffer = deque()
+        self._status_flush_timer = QTimer(self)
+        self._status_flush_timer.setSingleShot(True)
+        self._status_flush_timer.setInterval(50)
+        self._status_flush_timer.timeout.connect(self._flush_status)
+        
         self.init_ui()
         self.connect_signals()
     
@@ -183,46 +311,16 @@ class ExcelImportWidget(QWidget):
         # 文件选择区域
         file_frame = QFrame()
         file_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        file_frame.setStyleSheet("QFrame { border: 1px solid #bdc3c7; border-radius: 5px; padding: 10px; }")
+        file_frame.setStyleSheet(_FRAME_QSS)
         file_layout = QVBoxLayout(file_frame)
         
         # 文件选择按钮
         file_btn_layout = QHBoxLayout()
         self.select_file_btn = QPushButton("📁 选择Excel文件")
-        self.select_file_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
+        self.select_file_btn.setStyleSheet(_SELECT_BTN_QSS)
         
         self.create_template_btn = QPushButton("📝 创建模板")
-        self.create_template_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #9b59b6;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #8e44ad;
-            }
-            QPushButton:pressed {
-                background-color: #7d3c98;
-            }
-        """)
+        self.create_template_btn.setStyleSheet(_TEMPLATE_BTN_QSS)
         
         file_btn_layout.addWidget(self.select_file_btn)
         file_btn_layout.addWidget(self.create_template_btn)
@@ -239,7 +337,7 @@ class ExcelImportWidget(QWidget):
         # 导入设置区域
         settings_frame = QFrame()
         settings_frame.setFrameStyle(QFrame.Shape.StyledPanel)
-        settings_frame.setStyleSheet("QFrame { border: 1px solid #bdc3c7; border-radius: 5px; padding: 10px; }")
+        settings_frame.setStyleSheet(_FRAME_QSS)
         settings_layout = QVBoxLayout(settings_frame)
         
         settings_title = QLabel("⚙️ 导入设置")
@@ -277,72 +375,15 @@ class ExcelImportWidget(QWidget):
         
         self.validate_btn = QPushButton("[检测] 验证文件")
         self.validate_btn.setEnabled(False)
-        self.validate_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f39c12;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #e67e22;
-            }
-            QPushButton:pressed {
-                background-color: #d35400;
-            }
-            QPushButton:disabled {
-                background-color: #95a5a6;
-                color: #7f8c8d;
-            }
-        """)
+        self.validate_btn.setStyleSheet(_VALIDATE_BTN_QSS)
         
         self.import_btn = QPushButton("📥 导入任务")
         self.import_btn.setEnabled(False)
-        self.import_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-            QPushButton:disabled {
-                background-color: #95a5a6;
-                color: #7f8c8d;
-            }
-        """)
+        self.import_btn.setStyleSheet(_IMPORT_BTN_QSS)
         
         self.cancel_btn = QPushButton("❌ 取消")
         self.cancel_btn.setEnabled(False)
-        self.cancel_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-            QPushButton:pressed {
-                background-color: #a93226;
-            }
-            QPushButton:disabled {
-                background-color: #95a5a6;
-                color: #7f8c8d;
-            }
-        """)
+        self.cancel_btn.setStyleSheet(_CANCEL_BTN_QSS)
         
         btn_layout.addWidget(self.validate_btn)
         btn_layout.addWidget(self.import_btn)
@@ -354,33 +395,16 @@ class ExcelImportWidget(QWidget):
         # 进度条
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                text-align: center;
-                background-color: #ecf0f1;
-            }
-            QProgressBar::chunk {
-                background-color: #3498db;
-                border-radius: 4px;
-            }
-        """)
+        self.progress_bar.setStyleSheet(_PROGRESS_QSS)
         layout.addWidget(self.progress_bar)
         
         # 状态信息
         self.status_text = QTextEdit()
         self.status_text.setMaximumHeight(100)
         self.status_text.setReadOnly(True)
-        self.status_text.setStyleSheet("""
-            QTextEdit {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                background-color: #f8f9fa;
-                color: #2c3e50;
-                font-family: Consolas, monospace;
-            }
-        """)
+        # 只保留最近500行，超出时自动丢弃最早的内容
+        self.status_text.document().setMaximumBlockCount(500)
+        self.status_text.setStyleSheet(_STATUS_TEXT_QSS)
         layout.addWidget(self.status_text)
         
         layout.addStretch()
@@ -474,7 +498,8 @@ class ExcelImportWidget(QWidget):
     
     def on_import_progress(self, progress: int, message: str):
         """导入进度更新"""
-        self.progress_bar.setValue(progress)
+        if progress != self.progress_bar.value():
+            self.progress_bar.setValue(progress)
         self.append_status(f"📊 {progress}% - {message}")
     
     def on_import_completed(self, success: bool, message: str, tasks: List[PublishTask]):
@@ -505,9 +530,18 @@ class ExcelImportWidget(QWidget):
         """添加状态信息"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         formatted_message = f"[{timestamp}] {message}"
-        self.status_text.append(formatted_message)
+        self._status_buffer.append(formatted_message)
+        if not self._status_flush_timer.isActive():
+            self._status_flush_timer.start()
+        logger.info(formatted_message)
+    
+    def _flush_status(self):
+        """将缓冲的状态信息一次性追加到文本框"""
+        if not self._status_buffer:
+            return
+        self.status_text.append("\n".join(self._status_buffer))
+        self._status_buffer.clear()
         # 滚动到底部
         cursor = self.status_text.textCursor()
         cursor.movePosition(cursor.MoveOperation.End)
-        self.status_text.setTextCursor(cursor)
-        logger.info(formatted_message)
\ No newline at end of file
+        self.status_text.setTextCursor(cursor)
\ No newline at end of file
@@ -2,24 +2,451 @@
 任务详情表格组件
 支持排序、筛选、批量操作等功能
 """
-import sys
-from pathlib import Path
+import time
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QStyledItemDelegate, QStyle,
     QHeaderView, QAbstractItemView, QPushButton, QComboBox, QLineEdit,
-    QLabel, QCheckBox, QMessageBox, QMenu, QDateTimeEdit, QDialog
+    QLabel, QCheckBox, QMessageBox, QMenu, QDateTimeEdit
 )
-from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer
-from PyQt6.QtGui import QFont, QAction, QBrush, QColor
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, pyqtSlot, QTimer, QAbstractTableModel, QModelIndex, QEvent, QRect, QRectF
+)
+from PyQt6.QtGui import QFont, QAction, QBrush, QColor, QPainter, QCursor
 from loguru import logger
 
-# 添加core模块路径
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.models import PublishTask, TaskStatus
 
 
+# 状态显示文本
+STATUS_TEXT = {
+    TaskStatus.PENDING: "等待中",
+    TaskStatus.RUNNING: "执行中",
+    TaskStatus.COMPLETED: "已完成",
+    TaskStatus.FAILED: "失败"
+}
+# 筛选下拉框文本 -> 状态
+_STATUS_BY_TEXT = {text: status for status, text in STATUS_TEXT.items()}
+
+# 状态颜色及画刷，全局复用，避免每行重复构造
+_STATUS_COLOR = {
+    TaskStatus.PENDING: QColor("#6c757d"),     # 灰色
+    TaskStatus.RUNNING: QColor("#007bff"),     # 蓝色
+    TaskStatus.COMPLETED: QColor("#28a745"),   # 绿色
+    TaskStatus.FAILED: QColor("#dc3545")       # 红色
+}
+_DEFAULT_COLOR = QColor("#000000")
+_STATUS_BRUSH = {status: QBrush(color) for status, color in _STATUS_COLOR.items()}
+_DEFAULT_BRUSH = QBrush(_DEFAULT_COLOR)
+
+# 组件样式表，在组件上设置一次，按对象名匹配
+_TABLE_QSS = """
+QPushButton#batch_delete_btn {
+    background-color: #dc3545;
+    color: white;
+    border: none;
+    padding: 6px 12px;
+    border-radius: 3px;
+}
+QPushButton#batch_delete_btn:hover { background-color: #c82333; }
+QPushButton#batch_delete_btn:disabled { background-color: #6c757d; }
+"""
+
+# 定时刷新间隔（毫秒）：有未结束任务时 / 全部任务已结束时
+_ACTIVE_REFRESH_INTERVAL = 5000
+_IDLE_REFRESH_INTERVAL = 30000
+_ACTIVE_STATUSES = (TaskStatus.PENDING, TaskStatus.RUNNING)
+# 两次刷新的最小间隔（秒），更密集的刷新请求合并为一次
+_MIN_REFRESH_GAP = 0.5
+
+
+@lru_cache(maxsize=1024)
+def format_short_time(dt: datetime) -> str:
+    """格式化表格中的时间（按datetime缓存，任务时间未变时不重复格式化）"""
+    return dt.strftime("%m-%d %H:%M")
+
+
+class TaskTableModel(QAbstractTableModel):
+    """任务表格模型，只在视图请求时按需提供单元格数据
+    
+    每行的显示值在任务变化时预先计算为元组，set_tasks按任务ID比对新旧列表，
+    只对新增、删除的行发出结构变化通知，对内容变化的行发出dataChanged，
+    未变化的行不触发任何重绘。
+    """
+    
+    HEADERS = ["", "标题", "正文内容", "图片地址", "平台", "发布时间", "状态", "最后执行时间", "操作"]
+    CHECK_COLUMN = 0
+    TITLE_COLUMN = 1
+    TIME_COLUMN = 5
+    STATUS_COLUMN = 6
+    IMAGE_COLUMN = 3
+    ACTION_COLUMN = 8
+    # 行显示值元组中列1~7之后附加的字段位置
+    TOOLTIP_SLOT = 7
+    STATUS_SLOT = 8
+    ACTIONS_SLOT = 9
+    STAMP_SLOT = 10  # 计算显示值时任务的updated_time
+    ACTIONS_ROLE = Qt.ItemDataRole.UserRole + 1
+    
+    checked_changed = pyqtSignal()  # 勾选状态变化
+    publish_time_edited = pyqtSignal(str, datetime)  # 发布时间在表格内被编辑 (task_id, new_time)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks: List[PublishTask] = []
+        self._rows: List[tuple] = []  # 与_tasks并列的行显示值
+        self._row_by_id: Dict[str, int] = {}  # 任务ID -> 行号
+        self._checked: Set[str] = set()  # 已勾选的任务ID
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+    
+    def set_tasks(self, tasks: List[PublishTask]):
+        """按任务ID与当前数据比对，增量更新表格"""
+        new_by_id = {task.id: task for task in tasks}
+        changed = False
+        row_count = len(self._tasks)
+        
+        # 删除：从后往前按连续区间移除，减少结构变化通知次数
+        row = len(self._tasks) - 1
+        while row >= 0:
+            if self._tasks[row].id in new_by_id:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._tasks[row].id not in new_by_id:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            del self._tasks[row + 1:last + 1]
+            del self._rows[row + 1:last + 1]
+            self.endRemoveRows()
+            changed = True
+        self._reindex_rows()
+        
+        # 更新：只通知显示值变化的行（任务对象可能被原地修改，因此比较显示值）
+        last_column = len(self.HEADERS) - 1
+        for row, old_task in enumerate(self._tasks):
+            task = new_by_id[old_task.id]
+            # 任务的每次修改都会更新updated_time，未变化时直接沿用已计算的显示值
+            if task is old_task and task.updated_time == self._rows[row][self.STAMP_SLOT]:
+                continue
+            self._tasks[row] = task
+            values = self._row_values(task)
+            if values != self._rows[row]:
+                self._rows[row] = values
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+                changed = True
+        
+        # 新增：追加到末尾，一次通知
+        added = [task for task in tasks if task.id not in self._row_by_id]
+        if added:
+            first = len(self._tasks)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._tasks.extend(added)
+            self._rows.extend(self._row_values(task) for task in added)
+            self._reindex_rows()
+            self.endInsertRows()
+            changed = True
+        
+        # 已不在表格中的任务取消勾选；有勾选时行数变化也会改变全选状态
+        stale_checked = self._checked.difference(self._row_by_id)
+        if stale_checked:
+            self._checked -= stale_checked
+        if stale_checked or (self._checked and row_count != len(self._tasks)):
+            self.checked_changed.emit()
+        
+        if changed and self._sort_column >= 0:
+            self.sort(self._sort_column, self._sort_order)
+    
+    def _reindex_rows(self):
+        """重建任务ID到行号的索引"""
+        self._row_by_id = {task.id: row for row, task in enumerate(self._tasks)}
+    
+    @staticmethod
+    def _row_values(task: PublishTask) -> tuple:
+        """任务各列的显示值，以及提示文本、状态、可用操作和计算时的更新时间"""
+        # 正文内容 - 截取显示
+        content = task.content
+        if len(content) > 50:
+            content = content[:50] + "..."
+        
+        # 图片地址 - 显示第一张图片路径，如果有多张则添加数量
+        if task.images:
+            first_image = task.images[0]
+            # 如果路径太长，显示开头和结尾
+            if len(first_image) > 30:
+                display_path = f"{first_image[:15]}...{first_image[-12:]}"
+            else:
+                display_path = first_image
+            
+            if len(task.images) > 1:
+                image_text = f"{display_path} (+{len(task.images)-1})"
+            else:
+                image_text = display_path
+            image_tooltip = "\n".join(task.images)
+        else:
+            image_text = "无图片"
+            image_tooltip = None
+        
+        # 操作按钮：立即发布（等待中）、编辑（等待中和失败）、重试（可重试的失败任务）、删除
+        status = task.status
+        actions = []
+        if status == TaskStatus.PENDING:
+            actions.append("publish")
+        if status in (TaskStatus.PENDING, TaskStatus.FAILED):
+            actions.append("edit")
+        if status == TaskStatus.FAILED and task.can_retry():
+            actions.append("retry")
+        actions.append("delete")
+        
+        return (
+            task.title,
+            content,
+            image_text,
+            "小红书",
+            format_short_time(task.publish_time),
+            STATUS_TEXT.get(status, "未知"),
+            format_short_time(task.updated_time) if task.updated_time else "-",
+            image_tooltip,
+            status,
+            tuple(actions),
+            task.updated_time,
+        )
+    
+    def task_at(self, row: int) -> Optional[PublishTask]:
+        """获取指定行的任务"""
+        if 0 <= row < len(self._tasks):
+            return self._tasks[row]
+        return None
+    
+    def task_by_id(self, task_id: str) -> Optional[PublishTask]:
+        """根据任务ID获取表格中的任务"""
+        return self.task_at(self._row_by_id.get(task_id, -1))
+    
+    def checked_task_ids(self) -> List[str]:
+        """按表格顺序返回已勾选的任务ID（通过ID->行号索引排序，不遍历全部行）"""
+        return sorted(self._checked, key=self._row_by_id.__getitem__)
+    
+    def checked_count(self) -> int:
+        """已勾选的任务数量"""
+        return len(self._checked)
+    
+    def set_all_checked(self, checked: bool):
+        """勾选/取消勾选全部行"""
+        self._checked = set(self._row_by_id) if checked else set()
+        if self._tasks:
+            self.dataChanged.emit(
+                self.index(0, self.CHECK_COLUMN),
+                self.index(len(self._tasks) - 1, self.CHECK_COLUMN),
+                [Qt.ItemDataRole.CheckStateRole]
+            )
+        self.checked_changed.emit()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tasks)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def flags(self, index: QModelIndex):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.CHECK_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        elif index.isValid() and index.column() == self.TIME_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable  # 只有发布时间列可双击编辑
+        return flags
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row = index.row()
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if self.CHECK_COLUMN < column < self.ACTION_COLUMN:
+                return self._rows[row][column - 1]
+            return None  # 复选框列和按钮列不显示文本
+        
+        if role == Qt.ItemDataRole.CheckStateRole and column == self.CHECK_COLUMN:
+            if self._tasks[row].id in self._checked:
+                return Qt.CheckState.Checked
+            return Qt.CheckState.Unchecked
+        
+        if role == Qt.ItemDataRole.ForegroundRole and column == self.STATUS_COLUMN:
+            return _STATUS_BRUSH.get(self._rows[row][self.STATUS_SLOT], _DEFAULT_BRUSH)
+        
+        if role == Qt.ItemDataRole.ToolTipRole and column == self.IMAGE_COLUMN:
+            return self._rows[row][self.TOOLTIP_SLOT]
+        
+        if role == Qt.ItemDataRole.EditRole and column == self.TIME_COLUMN:
+            return self._tasks[row].publish_time
+        
+        if role == Qt.ItemDataRole.UserRole and column == self.TITLE_COLUMN:
+            return self._tasks[row].id
+        
+        if role == self.ACTIONS_ROLE and column == self.ACTION_COLUMN:
+            return self._rows[row][self.ACTIONS_SLOT]
+        
+        return None
+    
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if (index.isValid() and index.column() == self.TIME_COLUMN
+                and role == Qt.ItemDataRole.EditRole):
+            # 只通知编辑结果，由表格组件更新任务后随刷新一起更新显示
+            task = self._tasks[index.row()]
+            if value == task.publish_time:
+                return False
+            self.publish_time_edited.emit(task.id, value)
+            return True
+        
+        if (not index.isValid() or index.column() != self.CHECK_COLUMN
+                or role != Qt.ItemDataRole.CheckStateRole):
+            return False
+        
+        task_id = self._tasks[index.row()].id
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self._checked.add(task_id)
+        else:
+            self._checked.discard(task_id)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self.checked_changed.emit()
+        return True
+    
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        if not self.CHECK_COLUMN < column < self.ACTION_COLUMN:
+            self._sort_column = -1  # 复选框列和按钮列不排序，保持调度器中的顺序
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        
+        slot = column - 1
+        order_rows = sorted(
+            range(len(self._rows)),
+            key=lambda row: self._rows[row][slot],
+            reverse=order == Qt.SortOrder.DescendingOrder
+        )
+        self._tasks = [self._tasks[i] for i in order_rows]
+        self._rows = [self._rows[i] for i in order_rows]
+        self._reindex_rows()
+        
+        # 排序后让选中等持久索引跟随原任务
+        new_rows = {old: new for new, old in enumerate(order_rows)}
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [
+            self.index(new_rows[index.row()], index.column()) for index in persistent
+        ])
+        
+        self.layoutChanged.emit()
+
+
+class TaskButtonDelegate(QStyledItemDelegate):
+    """在操作列内直接绘制按钮，不为每行创建QPushButton控件"""
+    
+    button_clicked = pyqtSignal(str, int)  # (动作, 行号)
+    
+    # 动作 -> (文本, 背景色, 悬停色, 文字色, 是否加粗)
+    BUTTON_STYLES = {
+        "publish": ("立即发布", QColor("#28a745"), QColor("#218838"), QColor("white"), True),
+        "edit": ("编辑", QColor("#007bff"), QColor("#0056b3"), QColor("white"), False),
+        "retry": ("重试", QColor("#ffc107"), QColor("#e0a800"), QColor("#212529"), False),
+        "delete": ("删除", QColor("#dc3545"), QColor("#c82333"), QColor("white"), False),
+    }
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fonts: Dict[bool, QFont] = {}  # 是否加粗 -> 按钮字体，首次绘制时创建
+    
+    def _button_font(self, base: QFont, bold: bool) -> QFont:
+        """获取按钮字体（复用已创建的字体对象）"""
+        font = self._fonts.get(bold)
+        if font is None:
+            font = QFont(base)
+            font.setPixelSize(11)
+            font.setBold(bold)
+            self._fonts[bold] = font
+        return font
+    
+    @staticmethod
+    def _button_rects(rect: QRect, count: int) -> List[QRect]:
+        """计算单元格内各按钮区域"""
+        spacing = 4
+        inner = rect.adjusted(2, 2, -2, -2)
+        width = (inner.width() - spacing * (count - 1)) // count
+        return [
+            QRect(inner.left() + i * (width + spacing), inner.top(), width, inner.height())
+            for i in range(count)
+        ]
+    
+    def paint(self, painter: QPainter, option, index: QModelIndex):
+        super().paint(painter, option, index)
+        actions = index.data(TaskTableModel.ACTIONS_ROLE)
+        if not actions:
+            return
+        
+        cursor_pos = None
+        view = self.parent()
+        if option.state & QStyle.StateFlag.State_MouseOver and view is not None:
+            cursor_pos = view.viewport().mapFromGlobal(QCursor.pos())
+        
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for action, rect in zip(actions, self._button_rects(option.rect, len(actions))):
+            text, bg, hover_bg, fg, bold = self.BUTTON_STYLES[action]
+            hovered = cursor_pos is not None and rect.contains(cursor_pos)
+            
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(hover_bg if hovered else bg)
+            painter.drawRoundedRect(QRectF(rect), 2, 2)
+            
+            painter.setFont(self._button_font(option.font, bold))
+            painter.setPen(fg)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        view = self.parent()
+        if event.type() == QEvent.Type.MouseMove and view is not None:
+            # 刷新悬停效果
+            view.viewport().update(option.rect)
+        elif (event.type() == QEvent.Type.MouseButtonRelease
+              and event.button() == Qt.MouseButton.LeftButton):
+            actions = index.data(TaskTableModel.ACTIONS_ROLE)
+            if actions:
+                pos = event.position().toPoint()
+                for action, rect in zip(actions, self._button_rects(option.rect, len(actions))):
+                    if rect.contains(pos):
+                        self.button_clicked.emit(action, index.row())
+                        return True
+        return super().editorEvent(event, model, option, index)
+
+
+class PublishTimeDelegate(QStyledItemDelegate):
+    """发布时间列的编辑委托，双击单元格直接在表格内编辑，不再弹出对话框"""
+    
+    def createEditor(self, parent, option, index: QModelIndex):
+        editor = QDateTimeEdit(parent)
+        editor.setDisplayFormat("yyyy-MM-dd hh:mm")
+        editor.setCalendarPopup(True)
+        editor.setMinimumDateTime(datetime.now())
+        return editor
+    
+    def setEditorData(self, editor, index: QModelIndex):
+        publish_time = index.data(Qt.ItemDataRole.EditRole)
+        if publish_time is not None:
+            editor.setDateTime(publish_time)
+    
+    def setModelData(self, editor, model, index: QModelIndex):
+        model.setData(index, editor.dateTime().toPyDateTime(), Qt.ItemDataRole.EditRole)
+
+
 class TaskDetailTable(QWidget):
     """任务详情表格组件"""
     
@@ -36,10 +463,28 @@ class TaskDetailTable(QWidget):
         super().__init__(parent)
         self.tasks = []
         self.filtered_tasks = []
+        # 搜索索引: task_id -> (标题, 内容, 小写检索文本)
+        self._search_index: Dict[str, tuple] = {}
         self.scheduler = None
+        self._tasks_version: Optional[tuple] = None  # 上次刷新时的(任务版本号, 筛选状态)
+        self._total_count = 0  # 调度器中的任务总数
+        self._last_refresh = 0.0  # 上次刷新的时间（time.monotonic）
+        
+        # 刷新过于密集时延后执行的单次刷新
+        self._deferred_refresh = QTimer(self)
+        self._deferred_refresh.setSingleShot(True)
+        self._deferred_refresh.timeout.connect(self.refresh_table)
+        
+        # 筛选条件变化后延迟执行筛选，连续输入只在停顿后筛选一次
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self.refresh_table)
+        
+        self.setStyleSheet(_TABLE_QSS)
         self.setup_ui()
         self.setup_refresh_timer()
-        
+    
     def setup_ui(self):
         """设置界面"""
         layout = QVBoxLayout(self)
@@ -49,7 +494,9 @@ class TaskDetailTable(QWidget):
         layout.addLayout(filter_layout)
         
         # 表格
-        self.table = QTableWidget()
+        self.table = QTableView()
+        self.task_model = TaskTableModel(self.table)
+        self.table.setModel(self.task_model)
         self.setup_table()
         layout.addWidget(self.table)
         
@@ -65,14 +512,14 @@ class TaskDetailTable(QWidget):
         layout.addWidget(QLabel("状态筛选:"))
         self.status_filter = QComboBox()
         self.status_filter.addItems(["全部", "等待中", "执行中", "已完成", "失败"])
-        self.status_filter.currentTextChanged.connect(self.apply_filters)
+        self.status_filter.currentTextChanged.connect(self._schedule_filter)
         layout.addWidget(self.status_filter)
         
         # 关键词搜索
         layout.addWidget(QLabel("搜索:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("搜索标题或内容...")
-        self.search_input.textChanged.connect(self.apply_filters)
+        self.search_input.textChanged.connect(self._schedule_filter)
         layout.addWidget(self.search_input)
         
         # 清除筛选
@@ -94,28 +541,15 @@ class TaskDetailTable(QWidget):
         
         # 全选复选框
         self.select_all_cb = QCheckBox("全选")
-        self.select_all_cb.toggled.connect(self.on_select_all)
+        # 部分选中时 isChecked() 也为真，用 clicked 而非 toggled 才能响应每次点击
+        self.select_all_cb.clicked.connect(self.on_select_all)
         layout.addWidget(self.select_all_cb)
         
         # 批量删除按钮
         self.batch_delete_btn = QPushButton("批量删除")
         self.batch_delete_btn.clicked.connect(self.on_batch_delete)
         self.batch_delete_btn.setEnabled(False)
-        self.batch_delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                border: none;
-                padding: 6px 12px;
-                border-radius: 3px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-            QPushButton:disabled {
-                background-color: #6c757d;
-            }
-        """)
+        self.batch_delete_btn.setObjectName("batch_delete_btn")
         layout.addWidget(self.batch_delete_btn)
         
         layout.addStretch()
@@ -128,43 +562,65 @@ class TaskDetailTable(QWidget):
     
     def setup_table(self):
         """设置表格"""
-        # 设置列
-        headers = ["", "标题", "正文内容", "图片地址", "平台", "发布时间", "状态", "最后执行时间", "操作"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        
         # 设置表格属性
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setAlternatingRowColors(True)
+        # 用户点击表头前不排序，保持调度器中的顺序
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.table.setSortingEnabled(True)
+        self.table.setMouseTracking(True)  # 按钮悬停效果
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
         
+        # 操作列由委托绘制按钮
+        self.action_delegate = TaskButtonDelegate(self.table)
+        self.table.setItemDelegateForColumn(TaskTableModel.ACTION_COLUMN, self.action_delegate)
+        self.action_delegate.button_clicked.connect(self.on_row_button_clicked)
+        
         # 设置列宽
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)  # 复选框
         header.resizeSection(0, 30)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # 标题
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)  # 内容
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # 图片
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)  # 平台
-        header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)  # 发布时间
-        header.setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents)  # 状态
-        header.setSectionResizeMode(7, QHeaderView.ResizeMode.ResizeToContents)  # 最后执行时间
+        
+        # 图片/平台/时间/状态列按典型内容一次算好宽度，不随每次刷新测量所有单元格
+        fm = self.table.fontMetrics()
+        for column, samples in ((3, ["图片地址", "C:/Users/user/P...img_0001.jpg (+9)"]),
+                                (4, ["平台", "小红书"]),
+                                (5, ["发布时间", "00-00 00:00"]),
+                                (6, ["状态", *STATUS_TEXT.values()]),
+                                (7, ["最后执行时间", "00-00 00:00"])):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(column, max(fm.horizontalAdvance(t) for t in samples) + 24)
+        
         header.setSectionResizeMode(8, QHeaderView.ResizeMode.Fixed)  # 操作
-        header.resizeSection(8, 120)
+        header.resizeSection(8, 200)
         
-        # 连接选择变化信号
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        # 选中统计只取决于勾选状态，由模型在勾选变化时通知，行选择变化无需重新统计
+        self.task_model.checked_changed.connect(self.update_selection_stats)
         
-        # 连接双击编辑信号
-        self.table.itemDoubleClicked.connect(self.on_item_double_clicked)
+        # 发布时间列双击后由委托在表格内编辑
+        self.time_delegate = PublishTimeDelegate(self.table)
+        self.table.setItemDelegateForColumn(TaskTableModel.TIME_COLUMN, self.time_delegate)
+        self.task_model.publish_time_edited.connect(self.on_publish_time_edited)
     
     def setup_refresh_timer(self):
-        """设置刷新定时器"""
+        """设置刷新定时器（表格显示时才启动，见showEvent）"""
         self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(_ACTIVE_REFRESH_INTERVAL)
         self.refresh_timer.timeout.connect(self.refresh_table)
-        self.refresh_timer.start(5000)  # 每5秒刷新一次
+    
+    def showEvent(self, event):
+        """表格显示时立即补刷一次并恢复定时刷新"""
+        super().showEvent(event)
+        self.refresh_table()
+        self.refresh_timer.start()
+    
+    def hideEvent(self, event):
+        """切换到其他标签页或窗口最小化时停止定时刷新"""
+        super().hideEvent(event)
+        self.refresh_timer.stop()
     
     def set_scheduler(self, scheduler):
         """设置调度器引用"""
@@ -173,242 +629,134 @@ class TaskDetailTable(QWidget):
     
     def refresh_table(self):
         """刷新表格数据"""
-        if not self.scheduler:
+        # 隐藏时不刷新，重新显示时showEvent会补刷一次
+        if not self.scheduler or not self.isVisible():
             return
-            
+        
+        # 距上次刷新太近时合并到一次延后刷新
+        elapsed = time.monotonic() - self._last_refresh
+        if elapsed < _MIN_REFRESH_GAP:
+            if not self._deferred_refresh.isActive():
+                self._deferred_refresh.start(int((_MIN_REFRESH_GAP - elapsed) * 1000) + 1)
+            return
+        self._deferred_refresh.stop()
+        self._last_refresh = time.monotonic()
+        
         try:
-            # 获取最新任务列表
-            self.tasks = self.scheduler.get_all_tasks()
-            self.apply_filters()
+            # 任务版本和状态筛选都没有变化时，不重新获取和筛选任务
+            target_status = _STATUS_BY_TEXT.get(self.status_filter.currentText())
+            version = (self.scheduler.tasks_version, target_status)
+            if version == self._tasks_version:
+                return
+            self._tasks_version = version
+            
+            # 状态筛选交给调度器，只获取所选状态的任务（"全部"对应None）
+            self.tasks = self.scheduler.get_tasks(target_status)
+            self._total_count = self.scheduler.get_task_count()
+            
+            # 还有等待中/执行中的任务时保持5秒刷新，否则放慢到30秒
+            active = any(self.scheduler.get_task_count(status) for status in _ACTIVE_STATUSES)
+            interval = _ACTIVE_REFRESH_INTERVAL if active else _IDLE_REFRESH_INTERVAL
+            if self.refresh_timer.interval() != interval:
+                self.refresh_timer.setInterval(interval)
             
+            self._prune_search_index()
+            self.apply_filters()
+        
         except Exception as e:
             logger.error(f"❌ 刷新任务表格失败: {e}")
     
+    def _schedule_filter(self):
+        """筛选条件变化时重新开始计时，停止输入后再按新条件刷新"""
+        self._tasks_version = None
+        self._filter_timer.start()
+    
     def apply_filters(self):
-        """应用筛选条件"""
+        """应用筛选条件（self.tasks已按状态筛选，这里只做关键词搜索）"""
+        # 已直接筛选时取消尚未执行的延迟筛选
+        self._filter_timer.stop()
         try:
-            # 状态筛选
-            status_filter = self.status_filter.currentText()
             search_text = self.search_input.text().lower()
             
-            self.filtered_tasks = []
-            for task in self.tasks:
-                # 状态筛选
-                if status_filter != "全部":
-                    status_map = {
-                        "等待中": TaskStatus.PENDING,
-                        "执行中": TaskStatus.RUNNING,
-                        "已完成": TaskStatus.COMPLETED,
-                        "失败": TaskStatus.FAILED
-                    }
-                    if task.status != status_map.get(status_filter):
-                        continue
-                
+            if search_text:
                 # 关键词搜索
-                if search_text:
-                    searchable_text = f"{task.title} {task.content}".lower()
-                    if search_text not in searchable_text:
-                        continue
-                
-                self.filtered_tasks.append(task)
+                self.filtered_tasks = [
+                    task for task in self.tasks if search_text in self._search_text(task)
+                ]
+            else:
+                self.filtered_tasks = list(self.tasks)
             
             # 更新表格显示
             self.update_table_display()
             self.update_count_display()
-            
+        
         except Exception as e:
             logger.error(f"❌ 应用筛选失败: {e}")
     
+    def _search_text(self, task: PublishTask) -> str:
+        """获取任务的小写检索文本，标题或内容变化时才重新计算"""
+        cached = self._search_index.get(task.id)
+        if cached and cached[0] is task.title and cached[1] is task.content:
+            return cached[2]
+        
+        text = f"{task.title} {task.content}".lower()
+        self._search_index[task.id] = (task.title, task.content, text)
+        return text
+    
+    def _prune_search_index(self):
+        """移除已删除任务的检索文本"""
+        if len(self._search_index) > len(self.tasks):
+            task_ids = {task.id for task in self.tasks}
+            self._search_index = {
+                task_id: entry for task_id, entry in self._search_index.items()
+                if task_id in task_ids
+            }
+    
     def update_table_display(self):
-        """更新表格显示"""
+        """更新表格显示（模型按任务ID比对，只通知增删及内容变化的行）"""
+        # 多段增删、逐行变化通知和排序期间暂停重绘，结束后统一重绘一次
+        self.table.setUpdatesEnabled(False)
         try:
-            self.table.setRowCount(len(self.filtered_tasks))
-            
-            for row, task in enumerate(self.filtered_tasks):
-                # 复选框
-                checkbox = QCheckBox()
-                checkbox.toggled.connect(self.update_selection_stats)
-                self.table.setCellWidget(row, 0, checkbox)
-                
-                # 标题
-                title_item = QTableWidgetItem(task.title)
-                title_item.setData(Qt.ItemDataRole.UserRole, task.id)  # 存储task_id
-                self.table.setItem(row, 1, title_item)
-                
-                # 正文内容 - 截取显示
-                content = task.content
-                if len(content) > 50:
-                    content = content[:50] + "..."
-                self.table.setItem(row, 2, QTableWidgetItem(content))
-                
-                # 图片地址 - 显示路径
-                if task.images and len(task.images) > 0:
-                    # 显示第一张图片路径，如果有多张则添加数量
-                    first_image = task.images[0]
-                    # 如果路径太长，显示简化版本
-                    if len(first_image) > 30:
-                        # 显示开头和结尾
-                        display_path = f"{first_image[:15]}...{first_image[-12:]}"
-                    else:
-                        display_path = first_image
-                    
-                    if len(task.images) > 1:
-                        image_text = f"{display_path} (+{len(task.images)-1})"
-                    else:
-                        image_text = display_path
-                else:
-                    image_text = "无图片"
-                
-                image_item = QTableWidgetItem(image_text)
-                # 如果有图片，设置完整路径作为工具提示
-                if task.images:
-                    image_item.setToolTip("\n".join(task.images))
-                self.table.setItem(row, 3, image_item)
-                
-                # 平台
-                self.table.setItem(row, 4, QTableWidgetItem("小红书"))
-                
-                # 发布时间
-                publish_time = task.publish_time.strftime("%m-%d %H:%M")
-                self.table.setItem(row, 5, QTableWidgetItem(publish_time))
-                
-                # 状态 - 带颜色
-                status_item = QTableWidgetItem(self.get_status_text(task.status))
-                status_item.setForeground(QBrush(self.get_status_color(task.status)))
-                self.table.setItem(row, 6, status_item)
-                
-                # 最后执行时间
-                if task.updated_time:
-                    updated_time = task.updated_time.strftime("%m-%d %H:%M")
-                else:
-                    updated_time = "-"
-                self.table.setItem(row, 7, QTableWidgetItem(updated_time))
-                
-                # 操作按钮
-                actions_widget = self.create_action_buttons(task)
-                self.table.setCellWidget(row, 8, actions_widget)
-                
+            self.task_model.set_tasks(self.filtered_tasks)
         except Exception as e:
             logger.error(f"❌ 更新表格显示失败: {e}")
+        finally:
+            self.table.setUpdatesEnabled(True)
+            self.table.viewport().update()
     
-    def create_action_buttons(self, task: PublishTask) -> QWidget:
-        """创建操作按钮"""
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(2, 2, 2, 2)
-        layout.setSpacing(4)
-        
-        # 立即发布按钮（仅等待中任务显示）
-        if task.status == TaskStatus.PENDING:
-            publish_btn = QPushButton("立即发布")
-            publish_btn.clicked.connect(lambda checked, tid=task.id: self.on_publish_immediately(tid))
-            publish_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #28a745;
-                    color: white;
-                    border: none;
-                    padding: 4px 8px;
-                    border-radius: 2px;
-                    font-size: 11px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #218838;
-                }
-            """)
-            layout.addWidget(publish_btn)
-        
-        # 编辑按钮（仅等待中和失败的任务可以编辑）
-        if task.status in [TaskStatus.PENDING, TaskStatus.FAILED]:
-            edit_btn = QPushButton("编辑")
-            edit_btn.clicked.connect(lambda checked, tid=task.id: self.on_edit_task(tid))
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #007bff;
-                    color: white;
-                    border: none;
-                    padding: 4px 8px;
-                    border-radius: 2px;
-                    font-size: 11px;
-                }
-                QPushButton:hover {
-                    background-color: #0056b3;
-                }
-            """)
-            layout.addWidget(edit_btn)
-        
-        # 重试按钮（仅失败任务显示）
-        if task.status == TaskStatus.FAILED and task.can_retry():
-            retry_btn = QPushButton("重试")
-            retry_btn.clicked.connect(lambda checked, tid=task.id: self.on_retry_task(tid))
-            retry_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #ffc107;
-                    color: #212529;
-                    border: none;
-                    padding: 4px 8px;
-                    border-radius: 2px;
-                    font-size: 11px;
-                }
-                QPushButton:hover {
-                    background-color: #e0a800;
-                }
-            """)
-            layout.addWidget(retry_btn)
-        
-        # 删除按钮
-        delete_btn = QPushButton("删除")
-        delete_btn.clicked.connect(lambda checked, tid=task.id: self.on_delete_task(tid))
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #dc3545;
-                color: white;
-                border: none;
-                padding: 4px 8px;
-                border-radius: 2px;
-                font-size: 11px;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-        """)
-        layout.addWidget(delete_btn)
+    def on_row_button_clicked(self, action: str, row: int):
+        """行内按钮点击处理"""
+        task = self.task_model.task_at(row)
+        if not task:
+            return
         
-        return widget
+        if action == "publish":
+            self.on_publish_immediately(task.id)
+        elif action == "edit":
+            self.on_edit_task(task.id)
+        elif action == "retry":
+            self.on_retry_task(task.id)
+        elif action == "delete":
+            self.on_delete_task(task.id)
     
     def get_status_text(self, status: TaskStatus) -> str:
         """获取状态显示文本"""
-        status_map = {
-            TaskStatus.PENDING: "等待中",
-            TaskStatus.RUNNING: "执行中",
-            TaskStatus.COMPLETED: "已完成",
-            TaskStatus.FAILED: "失败"
-        }
-        return status_map.get(status, "未知")
+        return STATUS_TEXT.get(status, "未知")
     
     def get_status_color(self, status: TaskStatus) -> QColor:
         """获取状态颜色"""
-        color_map = {
-            TaskStatus.PENDING: QColor("#6c757d"),     # 灰色
-            TaskStatus.RUNNING: QColor("#007bff"),     # 蓝色
-            TaskStatus.COMPLETED: QColor("#28a745"),   # 绿色
-            TaskStatus.FAILED: QColor("#dc3545")       # 红色
-        }
-        return color_map.get(status, QColor("#000000"))
+        return _STATUS_COLOR.get(status, _DEFAULT_COLOR)
     
     def show_context_menu(self, position):
         """显示右键菜单"""
-        item = self.table.itemAt(position)
-        if not item:
+        index = self.table.indexAt(position)
+        if not index.isValid():
             return
-            
-        row = item.row()
-        task_id = self.table.item(row, 1).data(Qt.ItemDataRole.UserRole)
-        task = next((t for t in self.filtered_tasks if t.id == task_id), None)
         
+        task = self.task_model.task_at(index.row())
         if not task:
             return
-            
+        
         menu = QMenu(self)
         
         # 查看详情
@@ -433,7 +781,7 @@ class TaskDetailTable(QWidget):
             retry_action.triggered.connect(lambda: self.on_retry_task(task.id))
             menu.addAction(retry_action)
         
-        menu.exec(self.table.mapToGlobal(position))
+        menu.exec(self.table.viewport().mapToGlobal(position))
     
     def show_task_details(self, task: PublishTask):
         """显示任务详情"""
@@ -472,41 +820,38 @@ class TaskDetailTable(QWidget):
         """清除筛选条件"""
         self.status_filter.setCurrentText("全部")
         self.search_input.clear()
-        self.apply_filters()
-    
-    def on_select_all(self, checked: bool):
-        """全选/取消全选"""
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox:
-                checkbox.setChecked(checked)
+        self._tasks_version = None
+        self.refresh_table()
     
-    def on_selection_changed(self):
-        """选择变化"""
-        self.update_selection_stats()
+    def on_select_all(self, _checked: bool = False):
+        """全选/取消全选：已全部选中时取消，否则（含部分选中）全选"""
+        total = self.task_model.rowCount()
+        all_checked = total > 0 and self.task_model.checked_count() == total
+        # checked_changed 会触发 update_selection_stats，重新同步复选框显示
+        self.task_model.set_all_checked(not all_checked)
     
     def update_selection_stats(self):
         """更新选择统计"""
-        selected_count = 0
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox and checkbox.isChecked():
-                selected_count += 1
+        selected_count = self.task_model.checked_count()
         
         self.selection_label.setText(f"已选中: {selected_count}")
         self.batch_delete_btn.setEnabled(selected_count > 0)
         
-        # 更新全选复选框状态
-        if selected_count == 0:
-            self.select_all_cb.setChecked(False)
-        elif selected_count == self.table.rowCount():
-            self.select_all_cb.setChecked(True)
-        else:
-            self.select_all_cb.setCheckState(Qt.CheckState.PartiallyChecked)
+        # 更新全选复选框状态（只同步显示，不触发全选/取消全选）
+        self.select_all_cb.blockSignals(True)
+        try:
+            if selected_count == 0:
+                self.select_all_cb.setCheckState(Qt.CheckState.Unchecked)
+            elif selected_count == self.task_model.rowCount():
+                self.select_all_cb.setCheckState(Qt.CheckState.Checked)
+            else:
+                self.select_all_cb.setCheckState(Qt.CheckState.PartiallyChecked)
+        finally:
+            self.select_all_cb.blockSignals(False)
     
     def update_count_display(self):
         """更新计数显示"""
-        total_count = len(self.tasks)
+        total_count = self._total_count
         filtered_count = len(self.filtered_tasks)
         self.count_label.setText(f"显示: {filtered_count} / {total_count}")
     
@@ -530,18 +875,13 @@ class TaskDetailTable(QWidget):
     
     def on_batch_delete(self):
         """批量删除"""
-        selected_task_ids = []
-        for row in range(self.table.rowCount()):
-            checkbox = self.table.cellWidget(row, 0)
-            if checkbox and checkbox.isChecked():
-                task_id = self.table.item(row, 1).data(Qt.ItemDataRole.UserRole)
-                selected_task_ids.append(task_id)
+        selected_task_ids = self.task_model.checked_task_ids()
         
         if not selected_task_ids:
             return
-            
+        
         reply = QMessageBox.question(
-            self, "确认批量删除", 
+            self, "确认批量删除",
             f"确定要删除选中的 {len(selected_task_ids)} 个任务吗？",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
@@ -549,69 +889,18 @@ class TaskDetailTable(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             self.tasks_delete_requested.emit(selected_task_ids)
     
-    def on_item_double_clicked(self, item):
-        """处理双击编辑"""
-        if not item:
+    def on_publish_time_edited(self, task_id: str, new_time: datetime):
+        """发布时间编辑完成"""
+        task = self.task_model.task_by_id(task_id)
+        if not task:
             return
-            
-        row = item.row()
-        column = item.column()
         
-        # 只允许编辑发布时间列（第5列）
-        if column == 5:  # 发布时间列
-            task_id = self.table.item(row, 1).data(Qt.ItemDataRole.UserRole)
-            task = None
-            
-            # 找到对应的任务
-            for t in self.tasks:
-                if t.id == task_id:
-                    task = t
-                    break
-            
-            if task:
-                self.edit_publish_time(task)
-    
-    def edit_publish_time(self, task: PublishTask):
-        """编辑发布时间"""
-        dialog = QDialog(self)
-        dialog.setWindowTitle("编辑发布时间")
-        dialog.setModal(True)
-        dialog.resize(300, 150)
-        
-        layout = QVBoxLayout(dialog)
-        
-        # 时间选择器
-        time_edit = QDateTimeEdit(task.publish_time)
-        time_edit.setDisplayFormat("yyyy-MM-dd hh:mm")
-        time_edit.setCalendarPopup(True)
-        time_edit.setMinimumDateTime(datetime.now())
-        layout.addWidget(QLabel("选择发布时间:"))
-        layout.addWidget(time_edit)
-        
-        # 按钮
-        button_layout = QHBoxLayout()
-        
-        ok_btn = QPushButton("确定")
-        ok_btn.clicked.connect(dialog.accept)
-        button_layout.addWidget(ok_btn)
-        
-        cancel_btn = QPushButton("取消")
-        cancel_btn.clicked.connect(dialog.reject)
-        button_layout.addWidget(cancel_btn)
-        
-        layout.addLayout(button_layout)
-        
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            # 正确的方法：使用 toPython() 或 toPyDateTime()
-            qt_datetime = time_edit.dateTime()
-            new_time = qt_datetime.toPyDateTime()
-            
-            # 更新任务时间
-            task.publish_time = new_time
-            task.updated_time = datetime.now()
-            
-            # 发出信号通知更新
-            self.task_time_updated.emit(task.id, new_time)
-            
-            # 刷新显示
-            self.refresh_table()
\ No newline at end of file
+        # 更新任务时间
+        task.publish_time = new_time
+        task.updated_time = datetime.now()
+        
+        # 发出信号通知更新
+        self.task_time_updated.emit(task.id, new_time)
+        
+        # 刷新显示（等编辑器关闭后再刷新，避免提交编辑的过程中重排表格）
+        QTimer.singleShot(0, self.refresh_table)
\ No newline at end of file
@@ -2,8 +2,7 @@
 任务编辑对话框
 用于编辑任务的标题、内容、图片、话题和发布时间
 """
-import sys
-from pathlib import Path
+import re
 from datetime import datetime
 from typing import List, Optional
 from PyQt6.QtWidgets import (
@@ -16,10 +15,11 @@ from PyQt6.QtCore import Qt, pyqtSignal, QDateTime
 from PyQt6.QtGui import QFont
 from loguru import logger
 
-# 添加core模块路径
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.models import PublishTask
 
+# 话题分隔符：英文逗号、中文逗号和空白
+_TOPIC_SPLIT_RE = re.compile(r'[,，\s]+')
+
 
 class TaskEditDialog(QDialog):
     """任务编辑对话框"""
@@ -222,8 +222,7 @@ class TaskEditDialog(QDialog):
             topics = []
             if topics_text:
                 # 支持空格和逗号分隔
-                import re
-                topic_list = re.split(r'[,，\s]+', topics_text)
+                topic_list = _TOPIC_SPLIT_RE.split(topics_text)
                 for topic in topic_list:
                     topic = topic.strip()
                     if topic:
@@ -4,26 +4,25 @@
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QLineEdit, QTextEdit, QPushButton, QTableWidget, QTableWidgetItem,
+    QLabel, QLineEdit, QTextEdit, QPushButton,
     QDateTimeEdit, QFileDialog, QMessageBox, QSplitter, QGroupBox,
-    QComboBox, QSpinBox, QCheckBox, QTabWidget, QProgressBar,
-    QHeaderView, QAbstractItemView
+    QComboBox, QSpinBox, QCheckBox, QTabWidget, QProgressBar
+)
+from PyQt6.QtCore import (
+    QDateTime, QTimer, pyqtSignal, pyqtSlot, QProcess, QProcessEnvironment
 )
-from PyQt6.QtCore import Qt, QDateTime, QTimer, pyqtSlot
 from PyQt6.QtGui import QFont, QTextCursor
 from loguru import logger
 
-# 添加core模块路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.models import PublishTask, TaskStatus
 from core.scheduler import SimpleScheduler
 
 # 导入新组件
 from gui.components.control_panel import ControlPanel
-from gui.components.task_detail_table import TaskDetailTable
+from gui.components.task_detail_table import TaskDetailTable, STATUS_TEXT
 from gui.components.account_tab import AccountTab
 from gui.components.excel_importer import AsyncExcelImporter
 
@@ -34,117 +33,49 @@ from utils.operation_guard import operation_guard, safe_method, cleanup_on_exit
 class SampleTaskCreator:
     """示例任务创建器"""
     
-    @staticmethod
-    def create_sample_tasks() -> List[PublishTask]:
-        """创建示例任务"""
-        sample_tasks = []
-        
+    # 示例任务模板：(标题, 内容, 图片, 话题, 距当前的发布时间偏移)
+    _TEMPLATES = (
         # 示例任务1 - 美食分享
-        task1 = PublishTask.create_new(
-            title="分享今日美食制作心得",
-            content="今天尝试制作了红烧肉，经过3小时的慢炖，肉质软糯香甜。制作过程中有几个小技巧分享给大家：\n\n1. 肉要先焯水去腥\n2. 糖色要炒制得当\n3. 小火慢炖是关键\n\n大家有什么烹饪心得欢迎分享！ #美食制作 #红烧肉 #烹饪技巧",
-            images=["images/news1.png"],
-            topics=["美食制作", "红烧肉", "烹饪技巧"],
-            publish_time=datetime.now() + timedelta(minutes=10)
-        )
-        sample_tasks.append(task1)
-        
+        (
+            "分享今日美食制作心得",
+            "今天尝试制作了红烧肉，经过3小时的慢炖，肉质软糯香甜。制作过程中有几个小技巧分享给大家：\n\n1. 肉要先焯水去腥\n2. 糖色要炒制得当\n3. 小火慢炖是关键\n\n大家有什么烹饪心得欢迎分享！ #美食制作 #红烧肉 #烹饪技巧",
+            ("images/news1.png",),
+            ("美食制作", "红烧肉", "烹饪技巧"),
+            timedelta(minutes=10),
+        ),
         # 示例任务2 - 户外活动
-        task2 = PublishTask.create_new(
-            title="周末户外徒步记录",
-            content="昨天和朋友们一起去爬山，路程虽然有点累，但是山顶的风景真的很美！\n\n路线推荐：\n📍 起点：山脚停车场\n📍 终点：观景台\n⏰ 用时：约3小时\n💪 难度：中等\n\n记得带足够的水和零食，还有防晒用品。下次还要再来！ #户外徒步 #爬山 #周末活动",
-            images=["images/news1.png"],
-            topics=["户外徒步", "爬山", "周末活动"],
-            publish_time=datetime.now() + timedelta(hours=2)
-        )
-        sample_tasks.append(task2)
-        
+        (
+            "周末户外徒步记录",
+            "昨天和朋友们一起去爬山，路程虽然有点累，但是山顶的风景真的很美！\n\n路线推荐：\n📍 起点：山脚停车场\n📍 终点：观景台\n⏰ 用时：约3小时\n💪 难度：中等\n\n记得带足够的水和零食，还有防晒用品。下次还要再来！ #户外徒步 #爬山 #周末活动",
+            ("images/news1.png",),
+            ("户外徒步", "爬山", "周末活动"),
+            timedelta(hours=2),
+        ),
         # 示例任务3 - 读书笔记
-        task3 = PublishTask.create_new(
-            title="读书笔记：《高效能人士的七个习惯》",
-            content="最近在读这本经典的自我管理书籍，其中几个观点很有启发：\n\n📖 主要收获：\n1. 以终为始 - 明确目标很重要\n2. 要事第一 - 区分重要和紧急\n3. 双赢思维 - 合作大于竞争\n\n这些习惯不仅适用于工作，生活中也很实用。推荐给想要提升自己的朋友们！ #读书笔记 #自我提升 #高效能",
-            images=["images/news1.png"],
-            topics=["读书笔记", "自我提升", "高效能"],
-            publish_time=datetime.now() + timedelta(days=1)
-        )
-        sample_tasks.append(task3)
-        
-        return sample_tasks
-
-
-class TaskTableWidget(QTableWidget):
-    """任务表格组件"""
+        (
+            "读书笔记：《高效能人士的七个习惯》",
+            "最近在读这本经典的自我管理书籍，其中几个观点很有启发：\n\n📖 主要收获：\n1. 以终为始 - 明确目标很重要\n2. 要事第一 - 区分重要和紧急\n3. 双赢思维 - 合作大于竞争\n\n这些习惯不仅适用于工作，生活中也很实用。推荐给想要提升自己的朋友们！ #读书笔记 #自我提升 #高效能",
+            ("images/news1.png",),
+            ("读书笔记", "自我提升", "高效能"),
+            timedelta(days=1),
+        ),
+    )
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setup_table()
-    
-    def setup_table(self):
-        """设置表格"""
-        # 设置列
-        headers = ["标题", "发布时间", "状态", "结果", "操作"]
-        self.setColumnCount(len(headers))
-        self.setHorizontalHeaderLabels(headers)
-        
-        # 设置表格属性
-        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.setAlternatingRowColors(True)
-        
-        # 设置列宽
-        header = self.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)  # 标题自动调整
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)  # 时间
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)  # 状态
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)  # 结果
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)  # 操作
-    
-    def update_tasks(self, tasks: List[PublishTask]):
-        """更新任务列表"""
-        self.setRowCount(len(tasks))
-        
-        for row, task in enumerate(tasks):
-            # 标题
-            self.setItem(row, 0, QTableWidgetItem(task.title))
-            
-            # 发布时间
-            time_str = task.publish_time.strftime("%m-%d %H:%M")
-            self.setItem(row, 1, QTableWidgetItem(time_str))
-            
-            # 状态
-            status_text = self.get_status_text(task.status)
-            status_item = QTableWidgetItem(status_text)
-            self.setItem(row, 2, status_item)
-            
-            # 结果
-            result_text = task.result_message or ""
-            if len(result_text) > 30:
-                result_text = result_text[:30] + "..."
-            self.setItem(row, 3, QTableWidgetItem(result_text))
-            
-            # 操作按钮
-            delete_btn = QPushButton("删除")
-            delete_btn.clicked.connect(lambda checked, tid=task.id: self.delete_task(tid))
-            self.setCellWidget(row, 4, delete_btn)
-            
-            # 存储任务ID
-            self.item(row, 0).setData(Qt.ItemDataRole.UserRole, task.id)
-    
-    def get_status_text(self, status: TaskStatus) -> str:
-        """获取状态显示文本"""
-        status_map = {
-            TaskStatus.PENDING: "等待中",
-            TaskStatus.RUNNING: "执行中",
-            TaskStatus.COMPLETED: "已完成",
-            TaskStatus.FAILED: "失败"
-        }
-        return status_map.get(status, "未知")
-    
-    def delete_task(self, task_id: str):
-        """删除任务"""
-        if hasattr(self.parent(), 'delete_task'):
-            self.parent().delete_task(task_id)
-
-
+    @staticmethod
+    def create_sample_tasks() -> List[PublishTask]:
+        """创建示例任务"""
+        now = datetime.now()
+        # 任务的图片和话题列表可被编辑修改，每个任务使用独立的列表
+        return [
+            PublishTask.create_new(
+                title=title,
+                content=content,
+                images=list(images),
+                topics=list(topics),
+                publish_time=now + offset
+            )
+            for title, content, images, topics, offset in SampleTaskCreator._TEMPLATES
+        ]
 
 
 class LogWidget(QGroupBox):
@@ -189,10 +120,16 @@ class LogWidget(QGroupBox):
 class MainWindow(QMainWindow):
     """主窗口"""
     
+    # 账号测试结束 (账号名称, 是否成功)
+    account_test_finished = pyqtSignal(str, bool)
+    
     def __init__(self):
         super().__init__()
         self.scheduler = SimpleScheduler(self)
         
+        # 正在运行的账号测试进程 {账号名称: QProcess}
+        self._account_tests: Dict[str, QProcess] = {}
+        
         # 初始化Excel导入器
         self.excel_importer = AsyncExcelImporter(self)
         self.connect_excel_importer_signals()
@@ -288,6 +225,7 @@ class MainWindow(QMainWindow):
         """连接账号管理标签页信号"""
         self.account_tab.account_selected.connect(self.on_account_selected)
         self.account_tab.login_requested.connect(self.on_login_requested)
+        self.account_test_finished.connect(self.account_tab.on_test_finished)
     
     def connect_excel_importer_signals(self):
         """连接Excel导入器信号"""
@@ -318,11 +256,7 @@ class MainWindow(QMainWindow):
     def on_add_sample_tasks(self):
         """添加示例任务"""
         sample_tasks = SampleTaskCreator.create_sample_tasks()
-        added_count = 0
-        
-        for task in sample_tasks:
-            if self.scheduler.add_task(task):
-                added_count += 1
+        added_count = self.scheduler.add_tasks(sample_tasks)
         
         if added_count > 0:
             self.log_widget.add_log(f"📝 成功添加 {added_count} 个示例任务")
@@ -339,10 +273,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.information(self, "提示", "没有任务需要清空")
                 return
             
-            removed_count = 0
-            for task in tasks:
-                if self.scheduler.delete_task(task.id):
-                    removed_count += 1
+            removed_count = self.scheduler.delete_tasks([task.id for task in tasks])
             
             self.log_widget.add_log(f"🗑️ 清空了 {removed_count} 个任务")
             self.refresh_tasks()
@@ -405,7 +336,7 @@ class MainWindow(QMainWindow):
         
         # 检查任务状态
         if task.status != TaskStatus.PENDING:
-            QMessageBox.warning(self, "错误", f"任务状态不是等待中，无法立即发布\n当前状态: {self.get_status_text(task.status)}")
+            QMessageBox.warning(self, "错误", f"任务状态不是等待中，无法立即发布\n当前状态: {STATUS_TEXT.get(task.status, '未知')}")
             return
         
         # 检查是否已有任务在执行
@@ -438,23 +369,10 @@ class MainWindow(QMainWindow):
             # 刷新显示
             self.refresh_tasks()
     
-    def get_status_text(self, status: TaskStatus) -> str:
-        """获取状态显示文本"""
-        status_map = {
-            TaskStatus.PENDING: "等待中",
-            TaskStatus.RUNNING: "执行中", 
-            TaskStatus.COMPLETED: "已完成",
-            TaskStatus.FAILED: "失败"
-        }
-        return status_map.get(status, "未知")
-    
     def batch_delete_tasks(self, task_ids: List[str]):
         """批量删除任务"""
         try:
-            removed_count = 0
-            for task_id in task_ids:
-                if self.scheduler.delete_task(task_id):
-                    removed_count += 1
+            removed_count = self.scheduler.delete_tasks(task_ids)
             
             self.log_widget.add_log(f"🗑️ 批量删除了 {removed_count} 个任务")
             self.refresh_tasks()
@@ -544,86 +462,33 @@ class MainWindow(QMainWindow):
     def on_login_requested(self, account_name: str):
         """请求登录账号（测试账号）"""
         try:
+            running = self._account_tests.get(account_name)
+            if running and running.state() != QProcess.ProcessState.NotRunning:
+                self.log_widget.add_log(f"⏳ 账号 {account_name} 正在测试中，请稍候...")
+                return
+            
             self.log_widget.add_log(f"🔑 正在测试账号 {account_name} 的登录状态...")
             
-            # 使用 subprocess 运行账号测试器
-            import subprocess
-            import threading
-            
-            def run_account_test():
-                """在新线程中运行账号测试"""
-                try:
-                    # 构建命令
-                    cmd = [
-                        sys.executable,
-                        str(Path(__file__).parent.parent / "core" / "account_tester.py"),
-                        account_name
-                    ]
-                    
-                    # 运行测试
-                    logger.info(f"执行命令: {' '.join(cmd)}")
-                    
-                    # 设置环境变量确保子进程使用UTF-8输出，解决Windows编码问题
-                    import os
-                    import platform
-                    env = os.environ.copy()
-                    env['PYTHONIOENCODING'] = 'utf-8'
-                    
-                    # 根据系统选择合适的编码策略
-                    if platform.system() == "Windows":
-                        # Windows系统使用错误处理，避免编码问题
-                        process = subprocess.Popen(
-                            cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            encoding='utf-8',
-                            errors='replace',  # 用?替换无法解码的字符
-                            env=env
-                        )
-                    else:
-                        # 其他系统正常使用UTF-8
-                        process = subprocess.Popen(
-                            cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            encoding='utf-8',
-                            env=env
-                        )
-                    
-                    # 读取输出
-                    stdout, stderr = process.communicate()
-                    
-                    if process.returncode == 0:
-                        self.log_widget.add_log(f"✅ 账号测试完成")
-                        # 在账号标签页中显示结果
-                        self.account_tab.add_log(f"账号测试完成: {account_name}")
-                    else:
-                        self.log_widget.add_log(f"❌ 账号测试失败")
-                        self.account_tab.add_log(f"账号测试失败: {account_name}")
-                        if stderr:
-                            logger.error(f"测试错误: {stderr}")
-                            self.account_tab.add_log(f"测试错误: {stderr}")
-                    
-                    # 显示测试结果
-                    if stdout:
-                        lines = stdout.strip().split('\n')
-                        for line in lines:
-                            if "测试结果:" in line:
-                                self.log_widget.add_log(line.strip())
-                                self.account_tab.add_log(line.strip())
-                            elif line.strip() and not line.startswith("["):  # 过滤日志格式的行
-                                self.account_tab.add_log(line.strip())
-                    
-                except Exception as e:
-                    logger.error(f"❌ 运行账号测试失败: {e}")
-                    self.log_widget.add_log(f"❌ 运行账号测试失败: {e}")
-                    self.account_tab.add_log(f"运行账号测试失败: {e}")
+            # 构建命令
+            script = str(Path(__file__).parent.parent / "core" / "account_tester.py")
+            logger.info(f"执行命令: {' '.join([sys.executable, script, account_name])}")
+            
+            # 设置环境变量确保子进程使用UTF-8输出，解决Windows编码问题
+            env = QProcessEnvironment.systemEnvironment()
+            env.insert('PYTHONIOENCODING', 'utf-8')
             
-            # 在新线程中运行，避免阻塞GUI
-            thread = threading.Thread(target=run_account_test, daemon=True)
-            thread.start()
+            # QProcess在界面事件循环中异步运行，不需要单独的线程
+            process = QProcess(self)
+            process.setProcessEnvironment(env)
+            process.finished.connect(
+                lambda exit_code, exit_status: self._on_account_test_finished(
+                    account_name, exit_code, exit_status)
+            )
+            process.errorOccurred.connect(
+                lambda error: self._on_account_test_error(account_name, error)
+            )
+            self._account_tests[account_name] = process
+            process.start(sys.executable, [script, account_name])
             
             self.log_widget.add_log(f"📋 正在启动账号测试器，请稍候...")
             
@@ -633,17 +498,68 @@ class MainWindow(QMainWindow):
             self.account_tab.add_log(f"启动账号测试失败: {e}")
             QMessageBox.critical(self, "错误", f"启动账号测试失败: {e}")
     
+    def _on_account_test_finished(self, account_name: str, exit_code: int,
+                                  exit_status: QProcess.ExitStatus):
+        """账号测试进程结束"""
+        process = self._account_tests.pop(account_name, None)
+        if process is None:
+            return
+        process.deleteLater()
+        
+        try:
+            # 用?替换无法解码的字符，避免编码问题
+            stdout = bytes(process.readAllStandardOutput()).decode('utf-8', errors='replace')
+            stderr = bytes(process.readAllStandardError()).decode('utf-8', errors='replace')
+            success = exit_status == QProcess.ExitStatus.NormalExit and exit_code == 0
+            
+            if success:
+                self.log_widget.add_log(f"✅ 账号测试完成")
+                # 在账号标签页中显示结果
+                self.account_tab.add_log(f"账号测试完成: {account_name}")
+            else:
+                self.log_widget.add_log(f"❌ 账号测试失败")
+                self.account_tab.add_log(f"账号测试失败: {account_name}")
+                if stderr:
+                    logger.error(f"测试错误: {stderr}")
+                    self.account_tab.add_log(f"测试错误: {stderr}")
+            
+            # 显示测试结果
+            if stdout:
+                lines = stdout.strip().split('\n')
+                for line in lines:
+                    if "测试结果:" in line:
+                        self.log_widget.add_log(line.strip())
+                        self.account_tab.add_log(line.strip())
+                    elif line.strip() and not line.startswith("["):  # 过滤日志格式的行
+                        self.account_tab.add_log(line.strip())
+            
+            # 通知账号标签页测试结束
+            self.account_test_finished.emit(account_name, success)
+            
+        except Exception as e:
+            logger.error(f"❌ 运行账号测试失败: {e}")
+            self.log_widget.add_log(f"❌ 运行账号测试失败: {e}")
+            self.account_tab.add_log(f"运行账号测试失败: {e}")
+    
+    def _on_account_test_error(self, account_name: str, error: QProcess.ProcessError):
+        """账号测试进程启动失败"""
+        process = self._account_tests.get(account_name)
+        if error != QProcess.ProcessError.FailedToStart or process is None:
+            return  # 其他错误由finished信号处理
+        del self._account_tests[account_name]
+        message = process.errorString()
+        process.deleteLater()
+        logger.error(f"❌ 运行账号测试失败: {message}")
+        self.log_widget.add_log(f"❌ 运行账号测试失败: {message}")
+        self.account_tab.add_log(f"运行账号测试失败: {message}")
+        self.account_tab.add_log(f"账号测试失败: {account_name}")
+        self.account_test_finished.emit(account_name, False)
+    
     def on_tasks_imported(self, tasks: List[PublishTask]):
         """处理Excel导入的任务"""
         try:
-            added_count = 0
-            failed_count = 0
-            
-            for task in tasks:
-                if self.scheduler.add_task(task):
-                    added_count += 1
-                else:
-                    failed_count += 1
+            added_count = self.scheduler.add_tasks(tasks)
+            failed_count = len(tasks) - added_count
             
             # 记录日志
             self.log_widget.add_log(f"📥 Excel导入完成: 成功 {added_count} 个，失败 {failed_count} 个")
@@ -675,10 +591,15 @@ class MainWindow(QMainWindow):
         self.scheduler.scheduler_status.connect(self.on_scheduler_status)
     
     def setup_refresh_timer(self):
-        """设置刷新定时器"""
+        """设置刷新定时器
+        
+        任务表格自己按可见性和任务状态定时轮询，这里不再固定10秒刷新，
+        只把任务事件、按钮等触发的刷新请求在150ms内合并为一次。
+        """
         self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_tasks)
-        self.refresh_timer.start(10000)  # 每10秒刷新一次
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(150)
+        self.refresh_timer.timeout.connect(self._do_refresh)
     
     
     def delete_task(self, task_id: str):
@@ -697,6 +618,15 @@ class MainWindow(QMainWindow):
                 self.log_widget.add_log("❌ 任务删除失败")
     
     def refresh_tasks(self):
+        """请求刷新任务列表（短时间内的多次请求合并为一次）"""
+        refresh_timer = getattr(self, 'refresh_timer', None)
+        if refresh_timer is None:
+            # 定时器尚未创建或已在关闭时释放，直接刷新
+            self._do_refresh()
+        elif not refresh_timer.isActive():
+            refresh_timer.start()
+    
+    def _do_refresh(self):
         """刷新任务列表"""
         try:
             # 刷新任务详情表格
@@ -722,10 +652,7 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                removed_count = 0
-                for task in completed_tasks:
-                    if self.scheduler.delete_task(task.id):
-                        removed_count += 1
+                removed_count = self.scheduler.delete_tasks([task.id for task in completed_tasks])
                 
                 self.log_widget.add_log(f"🧹 清除了 {removed_count} 个已完成任务")
                 self.refresh_tasks()
@@ -776,11 +703,20 @@ class MainWindow(QMainWindow):
                 self.refresh_timer.deleteLater()
                 self.refresh_timer = None
             
+            # 终止尚未结束的账号测试进程
+            for process in getattr(self, '_account_tests', {}).values():
+                process.finished.disconnect()
+                process.kill()
+                process.waitForFinished(1000)
+            self._account_tests.clear()
+            
             # 清理调度器资源
             if hasattr(self, 'scheduler'):
                 self.scheduler.cleanup_resources()
             
             # 清理账号管理组件
+            if hasattr(self, 'account_tab'):
+                self.account_tab.flush_accounts()
             
             # 清理Excel导入器
             if hasattr(self, 'excel_importer'):
@@ -820,6 +756,8 @@ class MainWindow(QMainWindow):
     @safe_method(fallback_result=None, error_message="Excel导入进度处理失败")
     def on_excel_import_progress(self, progress: int, message: str):
         """处理Excel导入进度事件"""
+        if hasattr(self, 'control_panel'):
+            self.control_panel.set_import_progress(progress)
         self.log_widget.add_log(f"📈 导入进度: {progress}% - {message}")
     
     @safe_method(fallback_result=None, error_message="Excel导入完成处理失败")
@@ -833,10 +771,7 @@ class MainWindow(QMainWindow):
             self.log_widget.add_log(f"✅ Excel导入成功: {message}")
             
             # 添加任务到调度器
-            added_count = 0
-            for task in tasks:
-                if self.scheduler.add_task(task):
-                    added_count += 1
+            added_count = self.scheduler.add_tasks(tasks)
             
             self.log_widget.add_log(f"📝 成功添加 {added_count} 个任务")
             self.refresh_tasks()
@@ -29,14 +29,15 @@ def setup_logging(debug: bool = False):
         colorize=True
     )
     
-    # 文件日志
+    # 文件日志（enqueue=True：由后台线程写盘，GUI线程记录日志时不等待磁盘I/O）
     logger.add(
         "app.log",
         level="DEBUG",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} | {message}",
         rotation="10 MB",
         retention="7 days",
-        encoding="utf-8"
+        encoding="utf-8",
+        enqueue=True
     )
     
     logger.info("✅ 日志系统初始化完成")
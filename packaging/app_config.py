@@ -94,7 +94,7 @@ class PackagedAppConfig:
             colorize=True
         )
         
-        # 文件日志
+        # 文件日志（后台线程写盘，不阻塞GUI线程）
         log_file = self.path_detector.get_log_file_path()
         logger.add(
             str(log_file),
@@ -103,7 +103,8 @@ class PackagedAppConfig:
             rotation="10 MB",
             retention="7 days",
             compression="zip",
-            encoding="utf-8"
+            encoding="utf-8",
+            enqueue=True
         )
         
         logger.info(f"📋 日志系统初始化完成，日志文件: {log_file}")
@@ -122,6 +122,7 @@ hiddenimports = [
     # 数据处理
     'pandas',
     'openpyxl',
+    'python_calamine',
     'ujson',
     'loguru',
     'pydantic',
@@ -1,14 +1,58 @@
 """
 Excel文件导入工具
 """
+import importlib.util
+import sys
 import pandas as pd
 from pathlib import Path
-from datetime import datetime
-from typing import List, Tuple, Optional
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple, Optional
 from loguru import logger
 
 from core.models import PublishTask
 
+# 优先使用Rust实现的calamine引擎解析Excel（见requirements.txt），不可用时回退到pandas默认引擎
+# pandas 2.2.0起才支持engine="calamine"，更早的版本即使装了python_calamine也不能使用
+# 只检查python_calamine是否已安装，不在导入时加载其本地扩展
+try:
+    _pandas_version = tuple(int(part) for part in pd.__version__.split(".")[:2])
+except ValueError:
+    _pandas_version = (0, 0)
+_EXCEL_ENGINE = (
+    "calamine"
+    if _pandas_version >= (2, 2) and importlib.util.find_spec("python_calamine") is not None
+    else None
+)
+
+
+def read_excel(file_path, **kwargs) -> pd.DataFrame:
+    """读取Excel文件（calamine可用时使用calamine引擎）"""
+    return pd.read_excel(file_path, engine=_EXCEL_ENGINE, **kwargs)
+
+
+# 创建任务时每处理多少行汇报一次进度
+PROGRESS_EVERY_ROWS = 200
+
+# 创建任务用到的列（按此顺序逐行取值），统一按文本读取，避免数字标题变成"1.0"
+_TASK_COLUMNS = ["标题", "内容", "图片路径", "话题", "发布时间"]
+_TASK_DTYPES = {col: str for col in _TASK_COLUMNS}
+
+
+def _is_task_column(column) -> bool:
+    """是否为创建任务用到的列（供read_excel的usecols使用，缺少可选列时不报错）"""
+    return column in _TASK_DTYPES
+
+
+# 支持的发布时间格式
+_TIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%m-%d %H:%M",
+    "%m/%d %H:%M",
+)
+
 
 class ExcelImporter:
     """Excel导入器"""
@@ -17,37 +61,68 @@ class ExcelImporter:
         self.required_columns = ["标题", "内容"]
         self.optional_columns = ["图片路径", "发布时间", "话题"]
     
-    def validate_file(self, file_path: str) -> Tuple[bool, str]:
-        """验证Excel文件"""
+    @staticmethod
+    def _load_frame(file_path: Path) -> pd.DataFrame:
+        """完整读取Excel文件"""
+        # 只解析任务用到的列，模板中的备注等其他列直接跳过
+        return read_excel(file_path, usecols=_is_task_column, dtype=_TASK_DTYPES)
+    
+    def _check_path(self, file_path: Path) -> Optional[str]:
+        """检查文件路径，返回错误信息"""
+        # 检查文件存在
+        if not file_path.exists():
+            return "文件不存在"
+        
+        # 检查文件扩展名
+        if file_path.suffix.lower() not in ['.xlsx', '.xls']:
+            return "文件格式不正确，请使用Excel文件（.xlsx或.xls）"
+        
+        return None
+    
+    def _check_frame(self, df: pd.DataFrame) -> Optional[str]:
+        """检查表格内容，返回错误信息"""
+        # 检查必要列（先于空表检查：只读取任务列时，缺少这些列的表格读出来也是空的）
+        missing_columns = [col for col in self.required_columns if col not in df.columns]
+        if missing_columns:
+            return f"缺少必要列: {', '.join(missing_columns)}"
+        
+        # 检查是否为空
+        if df.empty:
+            return "Excel文件为空"
+        
+        return None
+    
+    def validate_header(self, file_path: str) -> Tuple[bool, str]:
+        """快速验证Excel文件：只读取表头和第一行数据检查结构"""
+        return self.validate_file(file_path, full=False)
+    
+    def validate_file(self, file_path: str, full: bool = False) -> Tuple[bool, str]:
+        """
+        验证Excel文件
+        
+        Args:
+            file_path: Excel文件路径
+            full: 是否完整解析整个文件（否则只读取表头和第一行数据）
+        """
         try:
             file_path = Path(file_path)
             
-            # 检查文件存在
-            if not file_path.exists():
-                return False, "文件不存在"
-            
-            # 检查文件扩展名
-            if file_path.suffix.lower() not in ['.xlsx', '.xls']:
-                return False, "文件格式不正确，请使用Excel文件（.xlsx或.xls）"
+            error = self._check_path(file_path)
+            if error:
+                return False, error
             
             # 尝试读取文件
             try:
-                df = pd.read_excel(file_path)
+                if full:
+                    df = self._load_frame(file_path)
+                else:
+                    df = read_excel(file_path, nrows=1)
             except Exception as e:
                 return False, f"读取Excel文件失败: {e}"
             
-            # 检查是否为空
-            if df.empty:
-                return False, "Excel文件为空"
-            
-            # 检查必要列
-            missing_columns = []
-            for col in self.required_columns:
-                if col not in df.columns:
-                    missing_columns.append(col)
-            
-            if missing_columns:
-                return False, f"缺少必要列: {', '.join(missing_columns)}"
+            error = self._check_frame(df)
+            if error:
+                return False, error
             
             return True, "文件验证通过"
             
@@ -56,7 +131,9 @@ class ExcelImporter:
             return False, f"验证失败: {e}"
     
     def import_tasks(self, file_path: str, start_time: Optional[datetime] = None, 
-                    interval_minutes: int = 30) -> Tuple[bool, str, List[PublishTask]]:
+                    interval_minutes: int = 30,
+                    progress_callback: Optional[Callable[[int, int], None]] = None
+                    ) -> Tuple[bool, str, List[PublishTask]]:
         """
         导入任务
         
@@ -64,32 +141,48 @@ class ExcelImporter:
             file_path: Excel文件路径
             start_time: 开始发布时间，如果为None则使用文件中的时间或当前时间
             interval_minutes: 发布间隔（分钟）
+            progress_callback: 进度回调 (已处理行数, 总行数)，每处理一批行调用一次
             
         Returns:
             (是否成功, 消息, 任务列表)
         """
         try:
-            # 验证文件
-            is_valid, message = self.validate_file(file_path)
-            if not is_valid:
-                return False, message, []
+            file_path = Path(file_path)
+            error = self._check_path(file_path)
+            if error:
+                return False, error, []
+            
+            # 读取Excel（只完整解析一次，校验直接基于解析结果）
+            try:
+                df = self._load_frame(file_path)
+            except Exception as e:
+                return False, f"读取Excel文件失败: {e}", []
+            
+            error = self._check_frame(df)
+            if error:
+                return False, error, []
             
-            # 读取Excel
-            df = pd.read_excel(file_path)
             logger.info(f"读取Excel文件: {len(df)} 行数据")
             
             tasks = []
             current_time = start_time or datetime.now()
+            step = timedelta(minutes=interval_minutes)
+            # 本次导入中本地图片路径的检查结果，多行引用同一图片时只访问一次文件系统
+            image_cache: Dict[str, Optional[str]] = {}
+            total_rows = len(df)
             
-            for index, row in df.iterrows():
+            # 按固定列顺序逐行取元组，缺少的可选列补为空值，避免为每行构造Series
+            rows = df.reindex(columns=_TASK_COLUMNS).itertuples(index=False, name=None)
+            for index, values in enumerate(rows):
+                if progress_callback and index % PROGRESS_EVERY_ROWS == 0:
+                    progress_callback(index, total_rows)
                 try:
-                    task = self._create_task_from_row(row, current_time, index, interval_minutes)
+                    task = self._create_task_from_row(values, current_time, index, interval_minutes,
+                                                      image_cache)
                     if task:
                         tasks.append(task)
                         # 下一个任务的时间
-                        current_time = task.publish_time
-                        from datetime import timedelta
-                        current_time += timedelta(minutes=interval_minutes)
+                        current_time = task.publish_time + step
                     
                 except Exception as e:
                     logger.warning(f"跳过第 {index + 2} 行（索引 {index}）: {e}")
@@ -105,13 +198,16 @@ class ExcelImporter:
             logger.error(f"导入Excel失败: {e}")
             return False, f"导入失败: {e}", []
     
-    def _create_task_from_row(self, row: pd.Series, base_time: datetime, 
-                             index: int, interval_minutes: int) -> Optional[PublishTask]:
-        """从行数据创建任务"""
+    def _create_task_from_row(self, values: tuple, base_time: datetime, 
+                             index: int, interval_minutes: int,
+                             image_cache: Optional[Dict[str, Optional[str]]] = None) -> Optional[PublishTask]:
+        """从行数据创建任务（values按_TASK_COLUMNS的顺序排列）"""
         try:
+            raw_title, raw_content, raw_images, raw_topics, raw_time = values
+            
             # 必要字段
-            title = str(row["标题"]).strip()
-            content = str(row["内容"]).strip()
+            title = str(raw_title).strip()
+            content = str(raw_content).strip()
             
             if not title or title == "nan":
                 raise ValueError("标题为空")
@@ -119,9 +215,9 @@ class ExcelImporter:
                 raise ValueError("内容为空")
             
             # 可选字段
-            images = self._parse_images(row.get("图片路径", ""))
-            topics = self._parse_topics(row.get("话题", ""))
-            publish_time = self._parse_publish_time(row.get("发布时间"), base_time, index, interval_minutes)
+            images = self._parse_images(raw_images, image_cache)
+            topics = self._parse_topics(raw_topics)
+            publish_time = self._parse_publish_time(raw_time, base_time, index, interval_minutes)
             
             # 创建任务
             task = PublishTask.create_new(
@@ -139,8 +235,15 @@ class ExcelImporter:
             logger.warning(f"创建任务失败: {e}")
             raise
     
-    def _parse_images(self, image_str: str) -> List[str]:
-        """解析图片路径"""
+    def _parse_images(self, image_str: str,
+                      image_cache: Optional[Dict[str, Optional[str]]] = None) -> List[str]:
+        """
+        解析图片路径
+        
+        Args:
+            image_str: 图片路径字符串
+            image_cache: 本地路径 -> 绝对路径（不存在为None）的缓存，由调用方在一次导入内共享
+        """
         if not image_str or str(image_str).strip() == "nan":
             return []
         
@@ -163,13 +266,21 @@ class ExcelImporter:
                     # URL直接添加
                     valid_paths.append(path)
                     logger.debug(f"添加图片URL: {path}")
+                elif image_cache is not None and path in image_cache:
+                    # 已检查过的本地图片
+                    if image_cache[path] is not None:
+                        valid_paths.append(image_cache[path])
                 else:
                     # 本地文件检查是否存在
+                    resolved = None
                     if Path(path).exists():
-                        valid_paths.append(str(Path(path).absolute()))
+                        resolved = str(Path(path).absolute())
+                        valid_paths.append(resolved)
                         logger.debug(f"添加本地图片: {path}")
                     else:
                         logger.warning(f"本地图片文件不存在: {path}")
+                    if image_cache is not None:
+                        image_cache[path] = resolved
         
         return valid_paths
     
@@ -195,7 +306,8 @@ class ExcelImporter:
                 # 确保话题以#开头
                 if not topic.startswith('#'):
                     topic = f'#{topic}'
-                clean_topics.append(topic)
+                # 同一话题在多行中重复出现，驻留后所有任务共享同一个字符串对象
+                clean_topics.append(sys.intern(topic))
         
         return clean_topics
     
@@ -205,35 +317,26 @@ class ExcelImporter:
         # 如果有指定时间，尝试解析
         if time_str and str(time_str).strip() != "nan":
             try:
-                # 尝试多种时间格式
-                time_formats = [
-                    "%Y-%m-%d %H:%M:%S",
-                    "%Y-%m-%d %H:%M",
-                    "%Y/%m/%d %H:%M:%S",
-                    "%Y/%m/%d %H:%M",
-                    "%m-%d %H:%M",
-                    "%m/%d %H:%M"
-                ]
-                
                 time_str = str(time_str).strip()
+                now = datetime.now()
                 
-                for fmt in time_formats:
+                # 尝试多种时间格式
+                for fmt in _TIME_FORMATS:
                     try:
                         parsed_time = datetime.strptime(time_str, fmt)
                         
                         # 如果只有月日，补充年份
                         if parsed_time.year == 1900:
-                            parsed_time = parsed_time.replace(year=datetime.now().year)
+                            parsed_time = parsed_time.replace(year=now.year)
                         
                         # 确保是未来时间
-                        if parsed_time <= datetime.now():
-                            if parsed_time.year == datetime.now().year:
+                        if parsed_time <= now:
+                            if parsed_time.year == now.year:
                                 # 如果是今年，可能是明年的时间
-                                parsed_time = parsed_time.replace(year=datetime.now().year + 1)
+                                parsed_time = parsed_time.replace(year=now.year + 1)
                             else:
                                 # 如果已经过了，加上间隔时间
-                                from datetime import timedelta
-                                parsed_time = datetime.now() + timedelta(minutes=(index + 1) * interval_minutes)
+                                parsed_time = now + timedelta(minutes=(index + 1) * interval_minutes)
                         
                         logger.debug(f"解析时间成功: {time_str} -> {parsed_time}")
                         return parsed_time
@@ -247,7 +350,6 @@ class ExcelImporter:
                 logger.warning(f"解析时间失败: {e}")
         
         # 使用基准时间 + 索引 * 间隔
-        from datetime import timedelta
         return base_time + timedelta(minutes=index * interval_minutes)
     
     def create_template(self, file_path: str) -> bool:
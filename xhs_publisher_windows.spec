@@ -131,6 +131,7 @@ hiddenimports = [
     'numpy',  # pandas的必需依赖
     'pandas',
     'openpyxl',
+    'python_calamine',
     'ujson',
     'loguru',
     'pydantic',